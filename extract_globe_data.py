@@ -6,48 +6,83 @@ OUTPUT: data/globe_locations.json
 """
 import re
 import json
+import codecs
 import requests
 from bs4 import BeautifulSoup
 
 
+# Compiled and opened once per process; repeated extractions reuse the
+# pattern and the pooled (gzip-negotiating) connection
+_SESSION = requests.Session()
+_LOC_RE = re.compile(rb'window\.globeLocations\s*=\s*')
+_DECODER = json.JSONDecoder()
+
+# What is left after the error position when the text ends inside a number
+# or a true/false/null literal
+_PARTIAL_TOKEN_RE = re.compile(r'\s*(-|\.|[eE][-+]?|t(r(u)?)?|f(a(l(s)?)?)?|n(u(l)?)?)?')
+
+
+def _is_truncated(error):
+    """
+    Whether a JSONDecodeError was raised because the document ended early.
+
+    json reports an unterminated string at its opening quote and a cut-off
+    \\uXXXX escape at its backslash; every other error on a cut-off document
+    is at the end, or just before a partial number or literal.
+    """
+    if error.msg.startswith('Unterminated string'):
+        return True
+    if error.msg.startswith('Invalid \\uXXXX escape'):
+        return len(error.doc) - error.pos < 6
+    return _PARTIAL_TOKEN_RE.fullmatch(error.doc, error.pos) is not None
+
+
 def extract_globe_locations(url="https://www.mil.be/nl/onze-missies/"):
-    """Extract the globeLocations array from the page."""
-
-    response = requests.get(url)
-    response.raise_for_status()
-    text = response.text
-
-    # Find where globeLocations starts
-    start_match = re.search(r'window\.globeLocations\s*=\s*', text)
-    if not start_match:
-        return None
-
-    start_pos = start_match.end()
-
-    # Extract the array by counting brackets
-    depth = 0
-    in_array = False
-    end_pos = start_pos
-
-    for i in range(start_pos, len(text)):
-        char = text[i]
-        if char == '[':
-            depth += 1
-            in_array = True
-        elif char == ']':
-            depth -= 1
-            if depth == 0 and in_array:
-                end_pos = i + 1
+    """
+    Extract the globeLocations array from the page.
+
+    The page is streamed in chunks and reading stops as soon as the array
+    has been decoded, so the rest of the body is never held in memory.
+    The marker is searched for in the raw bytes; only the bytes after it
+    are decoded (as UTF-8).
+    """
+
+    with _SESSION.get(url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=65536)
+
+        # Find where globeLocations starts, keeping a short tail of each
+        # chunk in case the marker is split across two chunks
+        buffer = b''
+        start_match = None
+        for chunk in chunks:
+            buffer += chunk
+            start_match = _LOC_RE.search(buffer)
+            if start_match:
                 break
+            buffer = buffer[-256:]
+
+        if not start_match:
+            return None
 
-    json_str = text[start_pos:end_pos]
+        # The incremental decoder holds back a multi-byte character that is
+        # split across two chunks
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        text = decoder.decode(buffer[start_match.end():]).lstrip()
 
-    try:
-        locations_data = json.loads(json_str)
-        return locations_data
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON: {e}")
-        return None
+        # Decode the array; raw_decode stops at the end of the first complete
+        # JSON value, so brackets inside strings cannot end it early. Another
+        # chunk is only read while the error is due to the text running out
+        while True:
+            try:
+                locations_data, _ = _DECODER.raw_decode(text)
+                return locations_data
+            except json.JSONDecodeError as e:
+                chunk = next(chunks, None) if _is_truncated(e) else None
+                if chunk is None:
+                    print(f"Error parsing JSON: {e}")
+                    return None
+                text += decoder.decode(chunk)
 
 
 if __name__ == "__main__":
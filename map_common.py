@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the visualize_*.py map scripts.
+
+The scripts import these instead of keeping their own copies; for the
+memoized loader that matters, since building several maps in one process
+only parses a file once when every script goes through the same cache.
+"""
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import folium
+from utils.map_making._jsonio import dump_json, load_json
+
+try:
+    import shapely.geometry
+except ImportError:  # shapely not installed, draw the full Natural Earth polygons
+    shapely = None
+
+try:
+    import minify_html
+except ImportError:  # minify-html not installed, save the HTML as folium renders it
+    minify_html = None
+
+# Rendered maps, keyed by a hash of their inputs (see map_cache_path)
+MAP_CACHE_DIR = 'maps/.cache'
+
+# Natural Earth countries simplified by simplify_geojson (needs shapely)
+SIMPLIFIED_FILE = 'data/geojson/ne_110m_simplified.geojson'
+
+# Hover style and popup box of the NATO and EU member countries
+MEMBER_HIGHLIGHT_STYLE = {'fillOpacity': 0.9, 'weight': 2.5}
+
+MEMBER_POPUP_STYLE = 'width: 260px; font-family: Arial, sans-serif;'
+
+
+@functools.lru_cache(maxsize=8)
+def _load_geojson(path, mtime):
+    """Parse a GeoJSON file; mtime is only part of the cache key."""
+    return load_json(path)
+
+
+def load_geojson(path):
+    """
+    Load a GeoJSON file, memoized per path and modification time.
+
+    The same parsed object is returned until the file changes, so treat it
+    as read-only.
+    """
+    return _load_geojson(os.path.abspath(path), os.path.getmtime(path))
+
+
+def round_coords(coords, ndigits):
+    """Round a (nested) GeoJSON coordinate list to ndigits decimals."""
+    if isinstance(coords[0], (int, float)):  # a single position
+        return [round(c, ndigits) for c in coords]
+    return [round_coords(c, ndigits) for c in coords]
+
+
+def get_trimmed_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson',
+                                trimmed_file='data/geojson/ne_110m_trimmed.geojson',
+                                load_countries=load_geojson):
+    """
+    Natural Earth countries with coordinates rounded to 4 decimals (~10 m)
+    and NAME as the only property (the ~80 others are never used here).
+
+    The rounded copy is written to trimmed_file on first use and read back
+    on later runs; it is rebuilt when cache_file is newer.
+
+    Args:
+        cache_file: Path to the countries GeoJSON
+        trimmed_file: Path of the trimmed copy
+        load_countries: Called with cache_file to load the full countries
+                        when the copy has to be (re)built
+    """
+    if os.path.exists(trimmed_file) and (
+            not os.path.exists(cache_file) or
+            os.path.getmtime(trimmed_file) >= os.path.getmtime(cache_file)):
+        return load_geojson(trimmed_file)
+
+    data = load_countries(cache_file)
+    data = dict(data, features=[
+        dict(feature,
+             properties={'NAME': feature['properties'].get('NAME')},
+             geometry=dict(feature['geometry'],
+                           coordinates=round_coords(feature['geometry']['coordinates'], 4)))
+        for feature in data['features']
+    ])
+
+    print(f"Saving trimmed Natural Earth data: {trimmed_file}")
+    dump_json(data, trimmed_file, compact=True)
+
+    return data
+
+
+def simplify_geojson(in_path, out_path, tol=0.05):
+    """
+    Write a copy of in_path with every geometry simplified to tol degrees.
+
+    At the zoom levels of these maps 0.05 degrees is below one pixel, and
+    preserve_topology keeps each polygon valid.
+
+    Returns:
+        The simplified FeatureCollection
+    """
+    data = load_geojson(in_path)
+    data = dict(data, features=[
+        dict(feature, geometry=shapely.geometry.mapping(
+            shapely.geometry.shape(feature['geometry']).simplify(tol, preserve_topology=True)))
+        for feature in data['features']
+    ])
+
+    print(f"Saving simplified Natural Earth data: {out_path}")
+    dump_json(data, out_path, compact=True)
+
+    return data
+
+
+def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson',
+                        simplified_file=SIMPLIFIED_FILE):
+    """
+    Load Natural Earth countries GeoJSON from cache.
+
+    The simplified copy is preferred when it is newer than cache_file; with
+    shapely installed it is (re)built here first. The parse is memoized by
+    load_geojson, so building several maps in one process reads it once.
+    Treat the result as read-only.
+    """
+    fresh = (os.path.exists(simplified_file) and
+             os.path.getmtime(simplified_file) >= os.path.getmtime(cache_file))
+    if shapely is not None and not fresh:
+        simplify_geojson(cache_file, simplified_file)
+        fresh = True
+
+    if fresh:
+        return load_geojson(simplified_file)
+    return load_geojson(cache_file)
+
+
+def member_highlight(feature):
+    """folium highlight_function shared by all NATO and EU member countries."""
+    return MEMBER_HIGHLIGHT_STYLE
+
+
+def save_map(m, output_file):
+    """
+    Save the map to output_file, minified when minify-html is installed.
+
+    Args:
+        m: folium.Map to render
+        output_file: Path of the HTML file to write
+    """
+    if minify_html is None:
+        m.save(output_file)
+        return
+
+    html = minify_html.minify(m.get_root().render(), minify_js=True, minify_css=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+def write_gzip_copy(output_file):
+    """
+    Write a gzip-compressed copy of output_file next to it (output_file.gz).
+
+    The map HTML embeds its GeoJSON as text, which compresses well; the .gz
+    copy can be served as-is with Content-Encoding: gzip.
+    """
+    with open(output_file, 'rb') as fi, gzip.open(output_file + '.gz', 'wb', compresslevel=6) as fo:
+        shutil.copyfileobj(fi, fo)
+
+
+def map_cache_path(script_file, output_file, key, *input_files):
+    """
+    Path of the cached HTML of output_file for these inputs.
+
+    Args:
+        script_file: The calling script; its modification time is hashed
+                     along with this module's and the folium version, so
+                     code changes and folium upgrades also miss the cache
+        output_file: Map HTML path; its name prefixes the cache entry
+        key: JSON-serializable arguments the rendered HTML depends on
+        input_files: Files whose contents are hashed (missing ones are skipped)
+    """
+    h = hashlib.blake2b(json.dumps(key, sort_keys=True).encode('utf-8'))
+    for path in input_files:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    for part in (os.path.getmtime(script_file), os.path.getmtime(__file__), folium.__version__):
+        h.update(str(part).encode('utf-8'))
+
+    stem = os.path.splitext(os.path.basename(output_file))[0]
+    return os.path.join(MAP_CACHE_DIR, f'{stem}-{h.hexdigest()}.html')
+
+
+def store_cached_map(output_file, cache_path):
+    """
+    Copy the saved output_file to cache_path (from map_cache_path).
+
+    Older entries for the same output name are removed, so the cache holds
+    one map per output.
+    """
+    os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+    stem = os.path.basename(cache_path).rsplit('-', 1)[0]
+    entry = re.compile(re.escape(stem) + r'-[0-9a-f]{128}\.html')
+    for name in os.listdir(MAP_CACHE_DIR):
+        path = os.path.join(MAP_CACHE_DIR, name)
+        if entry.fullmatch(name) and path != cache_path:
+            os.remove(path)
+
+    shutil.copy(output_file, cache_path)
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Rebuild the small theater GeoJSON files loaded by the map scripts.
+
+Run from the repository root after changing the country lists in
+visualize_map.py (LOCATION_TO_NAME) or visualize_inherent_resolve.py
+(OIR_COUNTRIES):
+
+    python -m scripts.build_theaters
+
+INPUT: data/geojson/ne_110m_admin_0_countries.geojson
+OUTPUT: data/geojson/missions_theater.geojson, data/geojson/oir_theater.geojson
+"""
+import visualize_inherent_resolve
+import visualize_map
+
+
+if __name__ == "__main__":
+    visualize_map.build_theater_geojson()
+    visualize_inherent_resolve.build_theater_geojson()
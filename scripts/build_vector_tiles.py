@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Slice the map layers into vector tiles for the --vector-tiles maps.
+
+Needs tippecanoe (https://github.com/felt/tippecanoe) on the PATH. Run from
+the repository root after rebuilding the theater files:
+
+    python -m scripts.build_vector_tiles
+
+The tiles are written uncompressed as a {z}/{x}/{y}.pbf directory so they
+can be served next to the maps as static files (GitHub Pages cannot send
+Content-Encoding for .pbf). The maps only use them when asked to, see
+create_inherent_resolve_map(vector_tiles=True) and
+create_nato_alliance_map(vector_tiles=True).
+
+INPUT: data/geojson/oir_theater.geojson, data/geojson/ne_110m_admin_0_countries.geojson
+OUTPUT: maps/tiles/oir/{z}/{x}/{y}.pbf, maps/tiles/nato/{z}/{x}/{y}.pbf (each with metadata.json)
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from utils.map_making._jsonio import dump_json
+from visualize_inherent_resolve import OIR_TILES_DIR, OIR_TILES_LAYER, OIR_TILES_MAXZOOM, THEATER_FILE
+from visualize_nato_alliance import NATO_TILES_DIR, NATO_TILES_LAYER, NATO_TILES_MAXZOOM, build_member_features
+
+
+def _run_tippecanoe(tippecanoe, source, output_dir, layer, maxzoom, *extra_args):
+    """Slice the GeoJSON file source into a tile directory at output_dir."""
+    subprocess.run([
+        tippecanoe,
+        '--output-to-directory', output_dir,
+        '--layer', layer,
+        '--maximum-zoom', str(maxzoom),
+        *extra_args,
+        '--no-tile-compression',
+        '--force',
+        source,
+    ], check=True)
+
+
+def build_vector_tiles(theater_file=THEATER_FILE, output_dir=OIR_TILES_DIR, nato_output_dir=NATO_TILES_DIR):
+    """
+    Run tippecanoe on theater_file and on the NATO member countries.
+
+    Args:
+        theater_file: OIR theater GeoJSON, sliced into output_dir
+        output_dir: Tile directory of the OIR map
+        nato_output_dir: Tile directory of the NATO alliance map
+
+    Returns:
+        True when the tiles were written, False when tippecanoe is missing
+    """
+    tippecanoe = shutil.which('tippecanoe')
+    if tippecanoe is None:
+        print("tippecanoe not found on PATH, no vector tiles written")
+        return False
+
+    _run_tippecanoe(tippecanoe, theater_file, output_dir, OIR_TILES_LAYER, OIR_TILES_MAXZOOM)
+    print(f"OIR vector tiles saved to {output_dir}")
+
+    # The member layer only exists in memory, tippecanoe reads it from a file
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, NATO_TILES_LAYER + '.geojson')
+        dump_json(build_member_features(), source, compact=True)
+        _run_tippecanoe(tippecanoe, source, nato_output_dir, NATO_TILES_LAYER, NATO_TILES_MAXZOOM,
+                        '--drop-densest-as-needed')
+    print(f"NATO vector tiles saved to {nato_output_dir}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build_vector_tiles() else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Numba-compiled versions of the hot geometric loops.
+
+Coordinates are passed as a contiguous (N, 2) float64 array and unpacked
+into scalars, so the inner loops run without boxing Python floats.
+
+Importing this module raises ImportError when numba is not installed;
+callers fall back to the pure Python/NumPy implementations.
+"""
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True)
+def _cross(ox, oy, ax, ay, bx, by):
+    """2D cross product of OA and OB (see geometry.cross_product_2d)."""
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+@numba.njit(cache=True)
+def _on_segment(px, py, qx, qy, rx, ry):
+    """Check if collinear point q lies on segment pr."""
+    return (min(px, rx) <= qx <= max(px, rx) and
+            min(py, ry) <= qy <= max(py, ry))
+
+
+@numba.njit(cache=True)
+def _bbox_disjoint(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y):
+    """Check if the bounding boxes of segments p1-p2 and p3-p4 are disjoint."""
+    return (max(p1x, p2x) < min(p3x, p4x) or
+            max(p3x, p4x) < min(p1x, p2x) or
+            max(p1y, p2y) < min(p3y, p4y) or
+            max(p3y, p4y) < min(p1y, p2y))
+
+
+@numba.njit(cache=True)
+def _seg_intersect(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y):
+    """Check if segment p1-p2 intersects segment p3-p4 (see geometry.segments_intersect)."""
+    if _bbox_disjoint(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y):
+        return False
+
+    d1 = _cross(p3x, p3y, p4x, p4y, p1x, p1y)
+    d2 = _cross(p3x, p3y, p4x, p4y, p2x, p2y)
+    d3 = _cross(p1x, p1y, p2x, p2y, p3x, p3y)
+    d4 = _cross(p1x, p1y, p2x, p2y, p4x, p4y)
+
+    # Proper intersection (segments cross each other)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and \
+       ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+
+    # Check if points are collinear and overlapping
+    if d1 == 0 and _on_segment(p3x, p3y, p1x, p1y, p4x, p4y):
+        return True
+    if d2 == 0 and _on_segment(p3x, p3y, p2x, p2y, p4x, p4y):
+        return True
+    if d3 == 0 and _on_segment(p1x, p1y, p3x, p3y, p2x, p2y):
+        return True
+    if d4 == 0 and _on_segment(p1x, p1y, p4x, p4y, p2x, p2y):
+        return True
+
+    return False
+
+
+@numba.njit(cache=True)
+def _is_edge_external(poly, i1, i2):
+    """
+    Check if the edge poly[i1]-poly[i2] crosses no polygon edge.
+
+    Args:
+        poly: Contiguous (N, 2) float64 array of polygon vertices
+        i1, i2: Indices of points to connect
+
+    Returns:
+        True if edge is external (see polygon_closing.is_edge_external)
+    """
+    p1x, p1y = poly[i1, 0], poly[i1, 1]
+    p2x, p2y = poly[i2, 0], poly[i2, 1]
+
+    n = poly.shape[0]
+    for i in range(n):
+        j = (i + 1) % n
+
+        # Skip edges that share an endpoint with our test edge
+        if i == i1 or i == i2 or j == i1 or j == i2:
+            continue
+
+        if _seg_intersect(p1x, p1y, p2x, p2y,
+                          poly[i, 0], poly[i, 1], poly[j, 0], poly[j, 1]):
+            return False
+
+    return True
+
+
+@numba.njit(parallel=True, cache=True)
+def _ring_edge_keys(vertex_ids, offsets):
+    """
+    Packed undirected edge keys for a stack of closed rings.
+
+    Ring r occupies vertex_ids[offsets[r]:offsets[r + 1]]; each vertex is
+    joined to the next one in its ring, the last one back to the first.
+    Rings are processed in parallel.
+
+    Args:
+        vertex_ids: int64 array of vertex ids for all rings, concatenated
+        offsets: int64 array of ring start positions, plus the total length
+
+    Returns:
+        uint64 array with one key per edge: (smaller id << 32) | larger id
+    """
+    keys = np.empty(vertex_ids.shape[0], dtype=np.uint64)
+    for r in numba.prange(offsets.shape[0] - 1):
+        start = offsets[r]
+        end = offsets[r + 1]
+        for k in range(start, end):
+            a = vertex_ids[k]
+            b = vertex_ids[k + 1] if k + 1 < end else vertex_ids[start]
+            lo = min(a, b)
+            hi = max(a, b)
+            keys[k] = (np.uint64(lo) << np.uint64(32)) | np.uint64(hi)
+    return keys
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+JSON file I/O for the map-making scripts.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson not installed, use the standard library
+    orjson = None
+
+
+def load_json(path):
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dumps_json(obj):
+    """Serialize obj to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def dump_json(obj, path, compact=False):
+    """Write obj to path as JSON indented by 2 spaces, or without whitespace when compact is set."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj) if compact else orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            if compact:
+                json.dump(obj, f, separators=(',', ':'))
+            else:
+                json.dump(obj, f, indent=2)
+
+
+def dump_feature_collection(features, path):
+    """
+    Stream a GeoJSON FeatureCollection to path, one compact feature per line.
+
+    Args:
+        features: Iterable of Feature dicts; only one is serialized at a time
+        path: Output file path
+    """
+    with open(path, 'wb') as f:
+        f.write(b'{"type": "FeatureCollection", "features": [\n')
+        for i, feature in enumerate(features):
+            if i:
+                f.write(b',\n')
+            if orjson is not None:
+                f.write(orjson.dumps(feature))
+            else:
+                f.write(json.dumps(feature).encode('utf-8'))
+        f.write(b'\n]}\n')
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Numba-compiled earcut (see triangulate.py for the reference implementation).
+
+The linked ring is stored as parallel arrays (structure of arrays) instead
+of Node objects: node k has integer grid coordinates x[k], y[k] (see
+triangulate._snap_to_grid; all predicates are exact int64 arithmetic),
+input index ids[k], ring links prev[k]/nxt[k] and z-order links
+prev_z[k]/next_z[k]; -1 stands for a missing link or a z value that has
+not been computed yet.
+reflex[k] caches whether the node is reflex (or collinear) with its
+current neighbours; it is refreshed whenever those change, so the ear
+tests only run the containment check for reflex vertices. Splitting the
+ring adds two nodes, so the buffers are sized for the worst case of n - 3
+splits.
+
+Importing this module raises ImportError when numba is not installed;
+callers fall back to the pure Python implementation.
+"""
+import numba
+
+# Must match triangulate.GRID_BITS - 15
+_Z_SHIFT = 15
+
+
+@numba.njit(cache=True)
+def _area(x, y, p, q, r):
+    """Signed area of triangle pqr; negative when p, q, r turn counter-clockwise."""
+    return (y[q] - y[p]) * (x[r] - x[q]) - (x[q] - x[p]) * (y[r] - y[q])
+
+
+@numba.njit(cache=True)
+def _equals(x, y, a, b):
+    return x[a] == x[b] and y[a] == y[b]
+
+
+@numba.njit(cache=True)
+def _sign(num):
+    if num > 0:
+        return 1
+    if num < 0:
+        return -1
+    return 0
+
+
+@numba.njit(cache=True)
+def _on_segment(x, y, p, q, r):
+    """Check if collinear point q lies on segment pr."""
+    return (min(x[p], x[r]) <= x[q] <= max(x[p], x[r]) and
+            min(y[p], y[r]) <= y[q] <= max(y[p], y[r]))
+
+
+@numba.njit(cache=True)
+def _intersects(x, y, p1, q1, p2, q2):
+    """Check if segment p1-q1 intersects segment p2-q2."""
+    o1 = _sign(_area(x, y, p1, q1, p2))
+    o2 = _sign(_area(x, y, p1, q1, q2))
+    o3 = _sign(_area(x, y, p2, q2, p1))
+    o4 = _sign(_area(x, y, p2, q2, q1))
+
+    if o1 != o2 and o3 != o4:
+        return True
+
+    if o1 == 0 and _on_segment(x, y, p1, p2, q1):
+        return True
+    if o2 == 0 and _on_segment(x, y, p1, q2, q1):
+        return True
+    if o3 == 0 and _on_segment(x, y, p2, p1, q2):
+        return True
+    if o4 == 0 and _on_segment(x, y, p2, q1, q2):
+        return True
+
+    return False
+
+
+@numba.njit(cache=True)
+def _point_in_triangle(ax, ay, bx, by, cx, cy, px, py):
+    """
+    Check if point p lies inside (or on) the counter-clockwise triangle abc.
+
+    The three edge signs are combined with & rather than and, so the test
+    compiles to straight-line code instead of two data-dependent branches.
+    """
+    return (((cx - px) * (ay - py) >= (ax - px) * (cy - py)) &
+            ((ax - px) * (by - py) >= (bx - px) * (ay - py)) &
+            ((bx - px) * (cy - py) >= (cx - px) * (by - py)))
+
+
+@numba.njit(cache=True)
+def _z_order(px, py):
+    """Morton code of a grid point, from its coordinates reduced to 15 bits."""
+    zx = px >> _Z_SHIFT
+    zy = py >> _Z_SHIFT
+
+    zx = (zx | (zx << 8)) & 0x00FF00FF
+    zx = (zx | (zx << 4)) & 0x0F0F0F0F
+    zx = (zx | (zx << 2)) & 0x33333333
+    zx = (zx | (zx << 1)) & 0x55555555
+
+    zy = (zy | (zy << 8)) & 0x00FF00FF
+    zy = (zy | (zy << 4)) & 0x0F0F0F0F
+    zy = (zy | (zy << 2)) & 0x33333333
+    zy = (zy | (zy << 1)) & 0x55555555
+
+    return zx | (zy << 1)
+
+
+@numba.njit(cache=True)
+def _update_reflex(p, x, y, prev, nxt, reflex):
+    """Refresh the reflex flag of node p after its neighbours changed."""
+    reflex[p] = _area(x, y, prev[p], p, nxt[p]) >= 0
+
+
+@numba.njit(cache=True)
+def _remove_node(p, x, y, prev, nxt, prev_z, next_z, reflex):
+    """Unlink a node from the ring and the z-order list."""
+    nxt[prev[p]] = nxt[p]
+    prev[nxt[p]] = prev[p]
+
+    if prev_z[p] >= 0:
+        next_z[prev_z[p]] = next_z[p]
+    if next_z[p] >= 0:
+        prev_z[next_z[p]] = prev_z[p]
+
+    _update_reflex(prev[p], x, y, prev, nxt, reflex)
+    _update_reflex(nxt[p], x, y, prev, nxt, reflex)
+
+
+@numba.njit(cache=True)
+def _filter_points(start, end, x, y, prev, nxt, prev_z, next_z, reflex):
+    """Remove duplicate and collinear points from the ring."""
+    p = start
+    while True:
+        again = False
+
+        if _equals(x, y, p, nxt[p]) or _area(x, y, prev[p], p, nxt[p]) == 0:
+            _remove_node(p, x, y, prev, nxt, prev_z, next_z, reflex)
+            p = end = prev[p]
+            if p == nxt[p]:
+                break
+            again = True
+        else:
+            p = nxt[p]
+
+        if not again and p == end:
+            break
+
+    return end
+
+
+@numba.njit(cache=True)
+def _sort_linked(head, z, prev_z, next_z):
+    """Sort the z-order list in place by z (linked list merge sort)."""
+    in_size = 1
+
+    while True:
+        p = head
+        head = -1
+        tail = -1
+        num_merges = 0
+
+        while p >= 0:
+            num_merges += 1
+            q = p
+            p_size = 0
+            for _ in range(in_size):
+                p_size += 1
+                q = next_z[q]
+                if q < 0:
+                    break
+
+            q_size = in_size
+
+            while p_size > 0 or (q_size > 0 and q >= 0):
+                if p_size != 0 and (q_size == 0 or q < 0 or z[p] <= z[q]):
+                    e = p
+                    p = next_z[p]
+                    p_size -= 1
+                else:
+                    e = q
+                    q = next_z[q]
+                    q_size -= 1
+
+                if tail >= 0:
+                    next_z[tail] = e
+                else:
+                    head = e
+
+                prev_z[e] = tail
+                tail = e
+
+            p = q
+
+        next_z[tail] = -1
+        in_size *= 2
+
+        if num_merges <= 1:
+            return head
+
+
+@numba.njit(cache=True)
+def _index_curve(start, x, y, prev, nxt, z, prev_z, next_z):
+    """Compute z-order codes and link the ring into a z-sorted list."""
+    p = start
+    while True:
+        if z[p] < 0:
+            z[p] = _z_order(x[p], y[p])
+        prev_z[p] = prev[p]
+        next_z[p] = nxt[p]
+        p = nxt[p]
+        if p == start:
+            break
+
+    next_z[prev_z[p]] = -1
+    prev_z[p] = -1
+
+    _sort_linked(p, z, prev_z, next_z)
+
+
+@numba.njit(cache=True)
+def _is_ear(ear, x, y, prev, nxt, reflex):
+    """Check if node ear forms an ear (see triangulate.is_ear)."""
+    a = prev[ear]
+    c = nxt[ear]
+
+    if _area(x, y, a, ear, c) >= 0:  # Clockwise or collinear - not an ear
+        return False
+
+    ax, ay, bx, by, cx, cy = x[a], y[a], x[ear], y[ear], x[c], y[c]
+
+    # Triangle bounding box
+    x0 = min(ax, bx, cx)
+    y0 = min(ay, by, cy)
+    x1 = max(ax, bx, cx)
+    y1 = max(ay, by, cy)
+
+    # Check if any other reflex vertex is inside this triangle
+    p = nxt[c]
+    while p != a:
+        if (reflex[p] and x0 <= x[p] <= x1 and y0 <= y[p] <= y1 and
+                _point_in_triangle(ax, ay, bx, by, cx, cy, x[p], y[p])):
+            return False
+        p = nxt[p]
+
+    return True
+
+
+@numba.njit(cache=True)
+def _blocks_ear(p, a, c, ax, ay, bx, by, cx, cy, x0, y0, x1, y1, x, y, reflex):
+    """Check if node p is a reflex vertex inside ear triangle abc."""
+    return (reflex[p] and x0 <= x[p] <= x1 and y0 <= y[p] <= y1 and p != a and p != c and
+            _point_in_triangle(ax, ay, bx, by, cx, cy, x[p], y[p]))
+
+
+@numba.njit(cache=True)
+def _is_ear_hashed(ear, x, y, prev, nxt, z, prev_z, next_z, reflex):
+    """Check if node ear forms an ear, scanning only its z-order range."""
+    a = prev[ear]
+    c = nxt[ear]
+
+    if _area(x, y, a, ear, c) >= 0:  # Clockwise or collinear - not an ear
+        return False
+
+    ax, ay, bx, by, cx, cy = x[a], y[a], x[ear], y[ear], x[c], y[c]
+
+    # Triangle bounding box
+    x0 = min(ax, bx, cx)
+    y0 = min(ay, by, cy)
+    x1 = max(ax, bx, cx)
+    y1 = max(ay, by, cy)
+
+    # z-order range for the current triangle bbox
+    min_z = _z_order(x0, y0)
+    max_z = _z_order(x1, y1)
+
+    p = prev_z[ear]
+    n = next_z[ear]
+
+    # Look for points inside the triangle in both directions
+    while p >= 0 and z[p] >= min_z and n >= 0 and z[n] <= max_z:
+        if _blocks_ear(p, a, c, ax, ay, bx, by, cx, cy, x0, y0, x1, y1, x, y, reflex):
+            return False
+        p = prev_z[p]
+
+        if _blocks_ear(n, a, c, ax, ay, bx, by, cx, cy, x0, y0, x1, y1, x, y, reflex):
+            return False
+        n = next_z[n]
+
+    # Look for remaining points in decreasing z-order
+    while p >= 0 and z[p] >= min_z:
+        if _blocks_ear(p, a, c, ax, ay, bx, by, cx, cy, x0, y0, x1, y1, x, y, reflex):
+            return False
+        p = prev_z[p]
+
+    # Look for remaining points in increasing z-order
+    while n >= 0 and z[n] <= max_z:
+        if _blocks_ear(n, a, c, ax, ay, bx, by, cx, cy, x0, y0, x1, y1, x, y, reflex):
+            return False
+        n = next_z[n]
+
+    return True
+
+
+@numba.njit(cache=True)
+def _locally_inside(a, b, x, y, prev, nxt):
+    """Check if a polygon diagonal a-b is locally inside the polygon."""
+    if _area(x, y, prev[a], a, nxt[a]) < 0:
+        return _area(x, y, a, b, nxt[a]) >= 0 and _area(x, y, a, prev[a], b) >= 0
+    return _area(x, y, a, b, prev[a]) < 0 or _area(x, y, a, nxt[a], b) < 0
+
+
+@numba.njit(cache=True)
+def _middle_inside(a, b, x, y, nxt):
+    """Check if the middle point of a polygon diagonal a-b is inside the polygon."""
+    p = a
+    inside = False
+    px = (x[a] + x[b]) / 2
+    py = (y[a] + y[b]) / 2
+
+    while True:
+        q = nxt[p]
+        if (((y[p] > py) != (y[q] > py)) and y[q] != y[p] and
+                px < (x[q] - x[p]) * (py - y[p]) / (y[q] - y[p]) + x[p]):
+            inside = not inside
+        p = q
+        if p == a:
+            break
+
+    return inside
+
+
+@numba.njit(cache=True)
+def _intersects_polygon(a, b, ids, x, y, nxt):
+    """Check if a polygon diagonal a-b intersects any polygon segment."""
+    p = a
+    while True:
+        q = nxt[p]
+        if (ids[p] != ids[a] and ids[q] != ids[a] and ids[p] != ids[b] and ids[q] != ids[b] and
+                _intersects(x, y, p, q, a, b)):
+            return True
+        p = q
+        if p == a:
+            return False
+
+
+@numba.njit(cache=True)
+def _is_valid_diagonal(a, b, ids, x, y, prev, nxt):
+    """Check if a diagonal between a and b splits the polygon into two valid ones."""
+    if ids[nxt[a]] == ids[b] or ids[prev[a]] == ids[b] or _intersects_polygon(a, b, ids, x, y, nxt):
+        return False
+
+    if (_locally_inside(a, b, x, y, prev, nxt) and _locally_inside(b, a, x, y, prev, nxt) and
+            _middle_inside(a, b, x, y, nxt) and
+            (_area(x, y, prev[a], a, prev[b]) != 0 or _area(x, y, a, prev[b], b) != 0)):
+        return True
+
+    return (_equals(x, y, a, b) and _area(x, y, prev[a], a, nxt[a]) > 0 and
+            _area(x, y, prev[b], b, nxt[b]) > 0)
+
+
+@numba.njit(cache=True)
+def _cure_local_intersections(start, ids, x, y, prev, nxt, prev_z, next_z, reflex,
+                              triangles, num_triangles):
+    """Clip away small self-intersections left after filtering."""
+    p = start
+    while True:
+        a = prev[p]
+        b = nxt[nxt[p]]
+
+        if (not _equals(x, y, a, b) and _intersects(x, y, a, p, nxt[p], b) and
+                _locally_inside(a, b, x, y, prev, nxt) and _locally_inside(b, a, x, y, prev, nxt)):
+            triangles[num_triangles, 0] = ids[a]
+            triangles[num_triangles, 1] = ids[p]
+            triangles[num_triangles, 2] = ids[b]
+            num_triangles += 1
+
+            # Remove two nodes involved
+            _remove_node(p, x, y, prev, nxt, prev_z, next_z, reflex)
+            _remove_node(nxt[p], x, y, prev, nxt, prev_z, next_z, reflex)
+
+            p = start = b
+
+        p = nxt[p]
+        if p == start:
+            break
+
+    return _filter_points(p, p, x, y, prev, nxt, prev_z, next_z, reflex), num_triangles
+
+
+@numba.njit(cache=True)
+def earcut_into(grid, hashed, x, y, ids, prev, nxt, z, prev_z, next_z, reflex, triangles):
+    """
+    Triangulate a counter-clockwise simple polygon into caller-owned buffers.
+
+    Every scratch array needs room for 3 * N nodes (splitting the ring adds
+    nodes) and may be larger; its previous contents are ignored.
+
+    Args:
+        grid: Contiguous (N, 2) int64 array of polygon vertices on the
+              triangulate grid, without the closing duplicate point
+        hashed: Index rings in z-order for the ear test
+        x, y, ids, prev, nxt, z, prev_z, next_z: int64 node arrays
+        reflex: bool node array
+        triangles: (3 * N, 3) or larger int64 array receiving the triangles
+
+    Returns:
+        Number of triangles written to the start of triangles
+    """
+    n = grid.shape[0]
+    capacity = 3 * n
+    z[:capacity] = -1
+    prev_z[:capacity] = -1
+    next_z[:capacity] = -1
+    num_triangles = 0
+
+    # Build the circular ring; node k is input vertex k
+    for k in range(n):
+        x[k] = grid[k, 0]
+        y[k] = grid[k, 1]
+        ids[k] = k
+        prev[k] = k - 1 if k > 0 else n - 1
+        nxt[k] = k + 1 if k < n - 1 else 0
+    num_nodes = n
+
+    for k in range(n):
+        _update_reflex(k, x, y, prev, nxt, reflex)
+
+    start = n - 1
+    if _equals(x, y, start, nxt[start]):
+        _remove_node(start, x, y, prev, nxt, prev_z, next_z, reflex)
+        start = nxt[start]
+
+    if nxt[start] == prev[start]:
+        return 0
+
+    # Rings still to be clipped, with their recovery pass
+    stack = [(start, 0)]
+
+    while len(stack) > 0:
+        ear, recovery_pass = stack.pop()
+
+        # Interlink polygon nodes in z-order
+        if recovery_pass == 0 and hashed:
+            _index_curve(ear, x, y, prev, nxt, z, prev_z, next_z)
+
+        stop = ear
+
+        # Iterate through ears, slicing them one by one
+        while prev[ear] != nxt[ear]:
+            p = prev[ear]
+            q = nxt[ear]
+
+            if hashed:
+                found = _is_ear_hashed(ear, x, y, prev, nxt, z, prev_z, next_z, reflex)
+            else:
+                found = _is_ear(ear, x, y, prev, nxt, reflex)
+
+            if found:
+                # Found an ear! Cut it off
+                triangles[num_triangles, 0] = ids[p]
+                triangles[num_triangles, 1] = ids[ear]
+                triangles[num_triangles, 2] = ids[q]
+                num_triangles += 1
+                _remove_node(ear, x, y, prev, nxt, prev_z, next_z, reflex)
+
+                # Skipping the next vertex leads to less sliver triangles
+                ear = nxt[q]
+                stop = nxt[q]
+                continue
+
+            ear = q
+
+            # If we looped through the whole remaining polygon and can't find any more ears
+            if ear == stop:
+                if recovery_pass == 0:
+                    # Try filtering points and slicing again
+                    stack.append((_filter_points(ear, ear, x, y, prev, nxt, prev_z, next_z, reflex), 1))
+                elif recovery_pass == 1:
+                    # If this didn't work, try curing all small self-intersections locally
+                    ear = _filter_points(ear, ear, x, y, prev, nxt, prev_z, next_z, reflex)
+                    ear, num_triangles = _cure_local_intersections(
+                        ear, ids, x, y, prev, nxt, prev_z, next_z, reflex, triangles, num_triangles)
+                    stack.append((ear, 2))
+                else:
+                    # As a last resort, try splitting the remaining polygon into two
+                    a = ear
+                    split = False
+                    while True:
+                        b = nxt[nxt[a]]
+                        while b != prev[a]:
+                            if ids[a] != ids[b] and _is_valid_diagonal(a, b, ids, x, y, prev, nxt):
+                                # Link a and b with a diagonal; b2 starts the second ring
+                                a2 = num_nodes
+                                b2 = num_nodes + 1
+                                num_nodes += 2
+                                x[a2], y[a2], ids[a2] = x[a], y[a], ids[a]
+                                x[b2], y[b2], ids[b2] = x[b], y[b], ids[b]
+                                an = nxt[a]
+                                bp = prev[b]
+
+                                nxt[a] = b
+                                prev[b] = a
+                                nxt[a2] = an
+                                prev[an] = a2
+                                prev[a2] = b2
+                                nxt[b2] = a2
+                                prev[b2] = bp
+                                nxt[bp] = b2
+
+                                for k in (a, b, a2, b2):
+                                    _update_reflex(k, x, y, prev, nxt, reflex)
+
+                                # Filter collinear points around the cuts
+                                a = _filter_points(a, nxt[a], x, y, prev, nxt, prev_z, next_z, reflex)
+                                c = _filter_points(b2, nxt[b2], x, y, prev, nxt, prev_z, next_z, reflex)
+
+                                stack.append((c, 0))
+                                stack.append((a, 0))
+                                split = True
+                                break
+                            b = nxt[b]
+
+                        a = nxt[a]
+                        if split or a == ear:
+                            break
+                break
+
+    return num_triangles
@@ -7,8 +7,8 @@ by connecting two points across the Danish straits.
 
 OUTPUT: data/test-data/baltic_sea_extracted.geojson
 """
-import json
 import os
+from ._jsonio import load_json, dump_json
 from .polygon_closing import close_polygon
 
 
@@ -25,7 +25,8 @@ def extract_baltic_sea(polygon, point1=None, point2=None):
         point2: Second closing point [lon, lat] (default: Göteborg, Sweden)
 
     Returns:
-        List of [lon, lat] coordinates forming Baltic Sea polygon
+        (N, 2) array of [lon, lat] coordinates forming Baltic Sea polygon,
+        or None if the closing edge is not external
     """
     # Default closing points across Danish straits
     if point1 is None:
@@ -56,8 +57,7 @@ if __name__ == "__main__":
 
     # Load the union data (from main data)
     union_path = os.path.join(data_dir, 'baltic_border_union.geojson')
-    with open(union_path, 'r') as f:
-        union_data = json.load(f)
+    union_data = load_json(union_path)
 
     # Get largest component (main landmass)
     components = union_data['geometry']['coordinates']
@@ -69,7 +69,7 @@ if __name__ == "__main__":
     # Extract Baltic Sea
     baltic_polygon = extract_baltic_sea(main_polygon)
 
-    if baltic_polygon:
+    if baltic_polygon is not None:
         # Save result
         baltic_geojson = {
             "type": "Feature",
@@ -80,13 +80,12 @@ if __name__ == "__main__":
             },
             "geometry": {
                 "type": "Polygon",
-                "coordinates": [baltic_polygon]
+                "coordinates": [baltic_polygon.tolist()]
             }
         }
 
         output_path = os.path.join(test_data_dir, 'baltic_sea_extracted.geojson')
-        with open(output_path, 'w') as f:
-            json.dump(baltic_geojson, f, indent=2)
+        dump_json(baltic_geojson, output_path)
 
         print(f"\n{'=' * 60}")
         print(f"  Baltic Sea polygon saved to:")
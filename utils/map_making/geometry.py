@@ -2,10 +2,25 @@
 """
 Common geometric operations for 2D points, lines, and polygons.
 
-Coordinates are represented as [x, y] or [lon, lat] lists.
+Points are [x, y] or [lon, lat] pairs. Polygons are handled as (N, 2)
+float64 NumPy arrays; public polygon functions also accept lists and
+convert them with _as_coords. Lists are only produced again at the GeoJSON
+I/O boundary.
 """
 import math
 
+import numpy as np
+
+# Storage dtype for coordinate buffers that are only scanned (nearest-vertex
+# search). Lon/lat at float32 keeps ~1e-5 degree precision and halves the
+# memory traffic; exact predicates, areas and output stay float64.
+COORD_DTYPE = np.float32
+
+
+def _as_coords(coords, dtype=np.float64):
+    """Return coords as an (N, 2) array of dtype (no copy if it already is one)."""
+    return np.asarray(coords, dtype=dtype)
+
 
 # ============================================================================
 # Basic 2D Operations
@@ -62,6 +77,19 @@ def on_segment(p, q, r):
             min(p[1], r[1]) <= q[1] <= max(p[1], r[1]))
 
 
+def _bbox_disjoint(p1, p2, p3, p4):
+    """
+    Check if the bounding boxes of segments p1-p2 and p3-p4 are disjoint.
+
+    Segments whose bounding boxes do not overlap cannot intersect, so this
+    is a cheap reject before the orientation tests.
+    """
+    return (max(p1[0], p2[0]) < min(p3[0], p4[0]) or
+            max(p3[0], p4[0]) < min(p1[0], p2[0]) or
+            max(p1[1], p2[1]) < min(p3[1], p4[1]) or
+            max(p3[1], p4[1]) < min(p1[1], p2[1]))
+
+
 def segments_intersect(p1, p2, p3, p4):
     """
     Check if line segment p1-p2 intersects with segment p3-p4.
@@ -76,6 +104,9 @@ def segments_intersect(p1, p2, p3, p4):
     Returns:
         True if segments intersect (including touching at endpoints)
     """
+    if _bbox_disjoint(p1, p2, p3, p4):
+        return False
+
     d1 = cross_product_2d(p3, p4, p1)
     d2 = cross_product_2d(p3, p4, p2)
     d3 = cross_product_2d(p1, p2, p3)
@@ -99,6 +130,49 @@ def segments_intersect(p1, p2, p3, p4):
     return False
 
 
+def _on_segment_batch(px, py, qx, qy, rx, ry):
+    """Elementwise on_segment for coordinate arrays (and/or scalars)."""
+    return ((np.minimum(px, rx) <= qx) & (qx <= np.maximum(px, rx)) &
+            (np.minimum(py, ry) <= qy) & (qy <= np.maximum(py, ry)))
+
+
+def segments_intersect_batch(p1, p2, starts, ends):
+    """
+    Vectorized segments_intersect of one segment against many.
+
+    Evaluates the same orientation and collinear-overlap tests as
+    segments_intersect for every segment starts[k]-ends[k] at once.
+
+    Args:
+        p1, p2: Segment endpoints [x, y]
+        starts, ends: (K, 2) arrays of the other segments' endpoints
+
+    Returns:
+        Boolean array of length K, True where the segments intersect
+    """
+    p1x, p1y = p1[0], p1[1]
+    p2x, p2y = p2[0], p2[1]
+    p3x, p3y = starts[:, 0], starts[:, 1]
+    p4x, p4y = ends[:, 0], ends[:, 1]
+
+    d1 = (p4x - p3x) * (p1y - p3y) - (p4y - p3y) * (p1x - p3x)
+    d2 = (p4x - p3x) * (p2y - p3y) - (p4y - p3y) * (p2x - p3x)
+    d3 = (p2x - p1x) * (p3y - p1y) - (p2y - p1y) * (p3x - p1x)
+    d4 = (p2x - p1x) * (p4y - p1y) - (p2y - p1y) * (p4x - p1x)
+
+    # Proper intersection (segments cross each other)
+    hit = ((((d1 > 0) & (d2 < 0)) | ((d1 < 0) & (d2 > 0))) &
+           (((d3 > 0) & (d4 < 0)) | ((d3 < 0) & (d4 > 0))))
+
+    # Collinear and overlapping
+    hit |= (d1 == 0) & _on_segment_batch(p3x, p3y, p1x, p1y, p4x, p4y)
+    hit |= (d2 == 0) & _on_segment_batch(p3x, p3y, p2x, p2y, p4x, p4y)
+    hit |= (d3 == 0) & _on_segment_batch(p1x, p1y, p3x, p3y, p2x, p2y)
+    hit |= (d4 == 0) & _on_segment_batch(p1x, p1y, p4x, p4y, p2x, p2y)
+
+    return hit
+
+
 # ============================================================================
 # Triangle Operations
 # ============================================================================
@@ -155,18 +229,12 @@ def normalize_edge(p1, p2):
     Useful for detecting duplicate edges in opposite directions.
 
     Args:
-        p1, p2: Edge endpoints (lists or tuples)
+        p1, p2: Edge endpoints as tuples (as produced by extract_edges)
 
     Returns:
         Tuple of (point1, point2) with point1 <= point2
     """
-    tp1 = tuple(p1) if not isinstance(p1, tuple) else p1
-    tp2 = tuple(p2) if not isinstance(p2, tuple) else p2
-
-    if tp1 < tp2:
-        return (tp1, tp2)
-    else:
-        return (tp2, tp1)
+    return (p1, p2) if p1 < p2 else (p2, p1)
 
 
 def extract_edges(polygon_coords):
@@ -174,18 +242,13 @@ def extract_edges(polygon_coords):
     Extract all edges from a polygon as pairs of consecutive points.
 
     Args:
-        polygon_coords: List of [x, y] coordinates
+        polygon_coords: (N, 2) array or list of [x, y] coordinates
 
     Returns:
         List of edges as tuples ((x1, y1), (x2, y2))
     """
-    edges = []
-    n = len(polygon_coords)
-    for i in range(n):
-        p1 = polygon_coords[i]
-        p2 = polygon_coords[(i + 1) % n]
-        edges.append((tuple(p1), tuple(p2)))
-    return edges
+    points = [tuple(p) for p in _as_coords(polygon_coords).tolist()]
+    return list(zip(points, points[1:] + points[:1]))
 
 
 def calculate_polygon_area(polygon):
@@ -193,47 +256,48 @@ def calculate_polygon_area(polygon):
     Calculate area of a polygon using the shoelace formula.
 
     Args:
-        polygon: List of [x, y] coordinates (closed or open)
+        polygon: List or (N, 2) array of [x, y] coordinates (closed or open)
 
     Returns:
         Area of polygon (always positive)
     """
+    coords = _as_coords(polygon)
+
     # Handle closed polygons (last point = first point)
-    coords = polygon[:-1] if polygon[0] == polygon[-1] else polygon
+    if (coords[0] == coords[-1]).all():
+        coords = coords[:-1]
 
-    area = 0
-    n = len(coords)
-    for i in range(n):
-        j = (i + 1) % n
-        area += coords[i][0] * coords[j][1]
-        area -= coords[j][0] * coords[i][1]
+    x = coords[:, 0]
+    y = coords[:, 1]
+    area = np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)
 
-    return abs(area) / 2.0
+    return abs(float(area)) / 2.0
 
 
-def find_closest_point_on_polygon(polygon, target):
+def find_closest_point_on_polygon(polygon_arr, target):
     """
     Find the closest point on polygon boundary to a target point.
 
+    Squared distances to all vertices are computed in a single vectorized
+    pass; only the winning distance is square-rooted. A float32 buffer
+    (see COORD_DTYPE) is scanned at float32 precision.
+
     Args:
-        polygon: List of [x, y] coordinates
+        polygon_arr: (N, 2) float array (or list) of [x, y] coordinates
         target: Target point [x, y]
 
     Returns:
         Tuple of (closest_point, index_in_polygon, distance)
     """
-    min_dist = float('inf')
-    closest_point = None
-    closest_idx = -1
+    polygon_arr = np.asarray(polygon_arr)
+    if polygon_arr.dtype.kind != 'f':
+        polygon_arr = _as_coords(polygon_arr)
 
-    for i, point in enumerate(polygon):
-        dist = distance(point, target)
-        if dist < min_dist:
-            min_dist = dist
-            closest_point = point
-            closest_idx = i
+    diff = polygon_arr - np.asarray(target, dtype=polygon_arr.dtype)
+    d2 = np.einsum('ij,ij->i', diff, diff)
+    idx = int(d2.argmin())
 
-    return closest_point, closest_idx, min_dist
+    return polygon_arr[idx].tolist(), idx, math.sqrt(d2[idx])
 
 
 def get_polygon_from_geojson(geometry):
@@ -246,16 +310,16 @@ def get_polygon_from_geojson(geometry):
         geometry: GeoJSON geometry dict with 'type' and 'coordinates'
 
     Returns:
-        List of polygon rings (each ring is a list of [lon, lat])
+        List of polygon rings (each ring is an (N, 2) array of [lon, lat])
     """
     polygons = []
 
     if geometry['type'] == 'Polygon':
         # Polygon has one outer ring (and optional holes)
-        polygons.append(geometry['coordinates'][0])
+        polygons.append(_as_coords(geometry['coordinates'][0]))
     elif geometry['type'] == 'MultiPolygon':
         # MultiPolygon has multiple polygons
         for poly in geometry['coordinates']:
-            polygons.append(poly[0])  # Outer ring of each polygon
+            polygons.append(_as_coords(poly[0]))  # Outer ring of each polygon
 
     return polygons
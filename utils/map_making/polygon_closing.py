@@ -8,10 +8,37 @@ path along the original polygon boundary.
 
 OUTPUT: data/test-data/baltic_sea_closed.geojson
 """
-import json
 import os
-from .geometry import (distance, find_closest_point_on_polygon,
-                       segments_intersect, calculate_polygon_area)
+import numpy as np
+from ._jsonio import load_json, dump_json
+from .geometry import (_as_coords, find_closest_point_on_polygon, segments_intersect_batch,
+                       calculate_polygon_area)
+
+try:
+    from ._geom_numba import _is_edge_external as _is_edge_external_nb
+except ImportError:  # numba not installed, use the pure Python version
+    _is_edge_external_nb = None
+
+
+def _chord_candidates(polygon_arr, idx1, idx2):
+    """
+    Indices of polygon edges whose bounding box overlaps that of the chord
+    polygon_arr[idx1]-polygon_arr[idx2].
+
+    Edge i runs from vertex i to vertex i+1. Segments with disjoint bounding
+    boxes cannot intersect, so only these candidates need the exact test.
+    """
+    starts = polygon_arr
+    ends = np.roll(polygon_arr, -1, axis=0)
+    edge_min = np.minimum(starts, ends)
+    edge_max = np.maximum(starts, ends)
+
+    chord_min = np.minimum(polygon_arr[idx1], polygon_arr[idx2])
+    chord_max = np.maximum(polygon_arr[idx1], polygon_arr[idx2])
+
+    overlap = ((edge_min[:, 0] <= chord_max[0]) & (edge_max[:, 0] >= chord_min[0]) &
+               (edge_min[:, 1] <= chord_max[1]) & (edge_max[:, 1] >= chord_min[1]))
+    return np.flatnonzero(overlap)
 
 
 def is_edge_external(polygon, idx1, idx2):
@@ -20,77 +47,55 @@ def is_edge_external(polygon, idx1, idx2):
     (doesn't intersect the polygon interior).
 
     Args:
-        polygon: List of polygon vertices
+        polygon: (N, 2) array or list of polygon vertices
         idx1, idx2: Indices of points to connect
 
     Returns:
         True if edge is external (doesn't intersect any polygon edges
         except at the endpoints)
     """
-    p1 = polygon[idx1]
-    p2 = polygon[idx2]
-
-    n = len(polygon)
+    polygon_arr = _as_coords(polygon)
+    n = len(polygon_arr)
 
-    # Check against all polygon edges
-    for i in range(n):
-        j = (i + 1) % n
+    # Only polygon edges whose bounding box overlaps the test edge can cross it
+    starts = _chord_candidates(polygon_arr, idx1, idx2)
+    ends = (starts + 1) % n
 
-        # Skip edges that share an endpoint with our test edge
-        if i == idx1 or i == idx2 or j == idx1 or j == idx2:
-            continue
+    # Skip edges that share an endpoint with our test edge
+    keep = (starts != idx1) & (starts != idx2) & (ends != idx1) & (ends != idx2)
+    starts, ends = starts[keep], ends[keep]
 
-        # Check if test edge intersects this polygon edge
-        if segments_intersect(p1, p2, polygon[i], polygon[j]):
-            return False
+    # Test the remaining edges against the test edge in one vectorized pass
+    return not segments_intersect_batch(polygon_arr[idx1], polygon_arr[idx2],
+                                        polygon_arr[starts], polygon_arr[ends]).any()
 
-    return True
 
-
-def extract_path(polygon, start_idx, end_idx, direction='forward'):
+def _path_indices(n, start_idx, end_idx, direction='forward'):
     """
-    Extract path along polygon from start_idx to end_idx.
+    Indices of the vertices along a polygon from start_idx to end_idx.
 
     Args:
-        polygon: List of polygon vertices
+        n: Number of polygon vertices
         start_idx: Starting index
         end_idx: Ending index
         direction: 'forward' or 'backward'
 
     Returns:
-        List of vertices along the path (including start and end)
+        Integer array of vertex indices along the path (including start and
+        end), wrapping around the polygon as needed
     """
-    n = len(polygon)
-    path = []
-
     if direction == 'forward':
-        # Go forward from start to end
-        if start_idx <= end_idx:
-            path = polygon[start_idx:end_idx+1]
-        else:
-            # Wrap around
-            path = polygon[start_idx:] + polygon[:end_idx+1]
+        length = (end_idx - start_idx) % n + 1
+        return np.arange(start_idx, start_idx + length) % n
     else:  # backward
-        # Go backward from start to end
-        if start_idx >= end_idx:
-            path = polygon[start_idx:end_idx-1:-1] if end_idx > 0 else polygon[start_idx::-1]
-            if end_idx == 0:
-                path.append(polygon[0])
-        else:
-            # Wrap around backward
-            path = polygon[start_idx::-1] + polygon[:end_idx-1:-1]
-            if end_idx == 0:
-                path.append(polygon[0])
-
-    return path
+        length = (start_idx - end_idx) % n + 1
+        return np.arange(start_idx, start_idx - length, -1) % n
 
 
 def calculate_path_length(path):
-    """Calculate total length of a path."""
-    length = 0
-    for i in range(len(path) - 1):
-        length += distance(path[i], path[i+1])
-    return length
+    """Calculate total length of a path (list or (N, 2) array of vertices)."""
+    segments = np.diff(_as_coords(path), axis=0)
+    return float(np.linalg.norm(segments, axis=1).sum())
 
 
 def close_polygon(polygon, point1, point2):
@@ -98,56 +103,65 @@ def close_polygon(polygon, point1, point2):
     Create a closed polygon by connecting two boundary points with an external edge.
 
     Args:
-        polygon: List of [lon, lat] coordinates (should not have duplicate end point)
+        polygon: (N, 2) array or list of [lon, lat] coordinates
         point1: First point [lon, lat] (can be approximate, will find closest on polygon)
         point2: Second point [lon, lat] (can be approximate, will find closest on polygon)
 
     Returns:
-        New polygon formed by external edge and shortest path between points,
-        or None if edge is not external
+        (M, 2) array forming the new closed polygon (external edge plus
+        shortest path between the points), or None if edge is not external
     """
-    # Make a copy and remove duplicate last point if present
-    poly = [list(p) for p in polygon]
-    if poly[0] == poly[-1]:
-        poly = poly[:-1]
+    # Drop duplicate last point if present
+    poly_arr = _as_coords(polygon)
+    if (poly_arr[0] == poly_arr[-1]).all():
+        poly_arr = poly_arr[:-1]
 
     # Find closest points on polygon boundary
-    p1, idx1, dist1 = find_closest_point_on_polygon(poly, point1)
-    p2, idx2, dist2 = find_closest_point_on_polygon(poly, point2)
+    _, idx1, dist1 = find_closest_point_on_polygon(poly_arr, point1)
+    _, idx2, dist2 = find_closest_point_on_polygon(poly_arr, point2)
 
     print(f"Found closest points:")
-    print(f"  Point 1: {p1} at index {idx1} (distance: {dist1:.4f})")
-    print(f"  Point 2: {p2} at index {idx2} (distance: {dist2:.4f})")
+    print(f"  Point 1: {poly_arr[idx1].tolist()} at index {idx1} (distance: {dist1:.4f})")
+    print(f"  Point 2: {poly_arr[idx2].tolist()} at index {idx2} (distance: {dist2:.4f})")
 
     # Check if connecting edge is external
-    if not is_edge_external(poly, idx1, idx2):
+    if _is_edge_external_nb is not None:
+        external = _is_edge_external_nb(np.ascontiguousarray(poly_arr), idx1, idx2)
+    else:
+        external = is_edge_external(poly_arr, idx1, idx2)
+
+    if not external:
         print("Warning: Edge is not external (intersects polygon)")
         return None
 
     print("  Edge is external")
 
-    # Extract both possible paths
-    path_forward = extract_path(poly, idx1, idx2, 'forward')
-    path_backward = extract_path(poly, idx1, idx2, 'backward')
+    # Cumulative arc length: cum_length[i] is the length from vertex 0 to i
+    n = len(poly_arr)
+    seg_lengths = np.linalg.norm(np.diff(poly_arr, axis=0), axis=1)
+    cum_length = np.concatenate([[0.0], np.cumsum(seg_lengths)])
+    total_length = cum_length[-1] + np.linalg.norm(poly_arr[0] - poly_arr[-1])
 
-    # Calculate lengths
-    len_forward = calculate_path_length(path_forward)
-    len_backward = calculate_path_length(path_backward)
+    # Both path lengths follow from the indices alone
+    len_forward = cum_length[idx2] - cum_length[idx1]
+    if idx1 > idx2:
+        len_forward += total_length
+    len_backward = total_length - len_forward if idx1 != idx2 else 0.0
 
     print(f"\nPath analysis:")
-    print(f"  Forward path: {len(path_forward)} vertices, length: {len_forward:.4f}")
-    print(f"  Backward path: {len(path_backward)} vertices, length: {len_backward:.4f}")
+    print(f"  Forward path: {(idx2 - idx1) % n + 1} vertices, length: {len_forward:.4f}")
+    print(f"  Backward path: {(idx1 - idx2) % n + 1} vertices, length: {len_backward:.4f}")
 
     # Choose shorter path
     if len_forward <= len_backward:
-        chosen_path = path_forward
+        chosen_path = _path_indices(n, idx1, idx2, 'forward')
         print(f"    Using forward path")
     else:
-        chosen_path = path_backward
+        chosen_path = _path_indices(n, idx1, idx2, 'backward')
         print(f"    Using backward path")
 
     # Create new closed polygon: path + closing edge
-    new_polygon = chosen_path + [chosen_path[0]]  # Close it
+    new_polygon = poly_arr[np.append(chosen_path, chosen_path[0])]  # Close it
 
     return new_polygon
 
@@ -162,8 +176,7 @@ def test_closing():
 
     # Load Baltic border union polygon (from main data)
     union_path = os.path.join(data_dir, 'baltic_border_union.geojson')
-    with open(union_path, 'r') as f:
-        union_data = json.load(f)
+    union_data = load_json(union_path)
 
     # Get largest component (main landmass)
     components = union_data['geometry']['coordinates']
@@ -207,13 +220,12 @@ def test_closing():
         },
         "geometry": {
             "type": "Polygon",
-            "coordinates": [closed_polygon]
+            "coordinates": [closed_polygon.tolist()]
         }
     }
 
     output_path = os.path.join(test_data_dir, 'baltic_sea_closed.geojson')
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    dump_json(output_data, output_path)
 
     print(f"\n  Saved to: {output_path}")
 
@@ -4,8 +4,15 @@ Simple polygon union algorithm without external geometry libraries.
 
 OUTPUT: data/baltic_border_union.geojson
 """
-import json
-from .geometry import normalize_edge, extract_edges, get_polygon_from_geojson
+from collections import deque
+import numpy as np
+from ._jsonio import load_json, dump_json
+from .geometry import get_polygon_from_geojson
+
+try:
+    from ._geom_numba import _ring_edge_keys
+except ImportError:  # numba not installed, pack keys with NumPy
+    _ring_edge_keys = None
 
 
 def union_polygons(geojson_features):
@@ -24,115 +31,96 @@ def union_polygons(geojson_features):
     Returns:
         List of [lon, lat] coordinates forming the union polygon
     """
-    # Step 1: Extract all edges from all input polygons
-    all_edges = []
-    edge_count = {}
-    directed_edges = {}  # Maps normalized edge to actual directed edges
+    # Step 1: Stack every input ring into one coordinate array; ring r
+    # occupies coords[offsets[r]:offsets[r + 1]]
+    rings = [ring for feature in geojson_features
+             for ring in get_polygon_from_geojson(feature['geometry'])]
+    if not rings:
+        print("No boundary edges found!")
+        return []
 
-    for feature in geojson_features:
-        polygons = get_polygon_from_geojson(feature['geometry'])
+    coords = np.concatenate(rings)
+    offsets = np.cumsum([0] + [len(ring) for ring in rings])
 
-        for polygon in polygons:
-            edges = extract_edges(polygon)
-            all_edges.extend(edges)
+    # Give every distinct vertex an integer id so edges hash as ints, not
+    # float tuples
+    vertices, vertex_ids = np.unique(coords, axis=0, return_inverse=True)
+    vertices = vertices.tolist()  # id -> [lon, lat]
+    vertex_ids = vertex_ids.reshape(-1)
 
-            for edge in edges:
-                # Normalize edge for counting
-                norm_edge = normalize_edge(edge[0], edge[1])
-                edge_count[norm_edge] = edge_count.get(norm_edge, 0) + 1
+    # Edge k runs from vertex k to the next vertex of its ring (wrapping)
+    next_pos = np.arange(1, len(coords) + 1)
+    next_pos[offsets[1:] - 1] = offsets[:-1]
 
-                # Keep track of directed edges
-                if norm_edge not in directed_edges:
-                    directed_edges[norm_edge] = []
-                directed_edges[norm_edge].append(edge)
+    # Pack each normalized edge (smaller id first) into a single uint64 and
+    # count occurrences in one vectorized pass
+    if _ring_edge_keys is not None:
+        edge_keys = _ring_edge_keys(vertex_ids, offsets)
+    else:
+        a = vertex_ids.astype(np.uint64)
+        b = a[next_pos]
+        edge_keys = (np.minimum(a, b) << np.uint64(32)) | np.maximum(a, b)
+    _, key_index, key_counts = np.unique(edge_keys, return_inverse=True,
+                                         return_counts=True)
 
     # Step 2: Find boundary edges (appear exactly once)
-    boundary_edges = []
-    for edge in all_edges:
-        norm_edge = normalize_edge(edge[0], edge[1])
-        if edge_count[norm_edge] == 1:
-            boundary_edges.append(edge)
+    boundary = np.flatnonzero(key_counts[key_index] == 1)
+    boundary_edges = list(zip(vertex_ids[boundary].tolist(),
+                              vertex_ids[next_pos[boundary]].tolist()))
 
     if not boundary_edges:
         print("No boundary edges found!")
         return []
 
-    print(f"Total edges: {len(all_edges)}")
+    print(f"Total edges: {len(edge_keys)}")
     print(f"Boundary edges: {len(boundary_edges)}")
-    print(f"Internal edges: {len(all_edges) - len(boundary_edges)}")
-
-    # Step 3: Build adjacency for chaining edges (bidirectional)
-    adjacency = {}  # point -> list of (next_point, edge_object) tuples
-    edge_objects = set(boundary_edges)  # Track which edges exist
-
-    for edge in boundary_edges:
-        p1, p2 = edge
-        # Add both directions
-        if p1 not in adjacency:
-            adjacency[p1] = []
-        if p2 not in adjacency:
-            adjacency[p2] = []
-        adjacency[p1].append(p2)
-        adjacency[p2].append(p1)
-
-    # Step 4: Chain edges together to form polygon(s)
-    if not adjacency:
-        print("No adjacency built!")
-        return []
+    print(f"Internal edges: {len(edge_keys) - len(boundary_edges)}")
 
-    visited = set()
+    # Step 3: Index boundary edges by endpoint for chaining (bidirectional)
+    neighbors = [deque() for _ in vertices]  # vertex id -> indices of boundary edges touching it
+    for edge_id, (p1, p2) in enumerate(boundary_edges):
+        neighbors[p1].append(edge_id)
+        neighbors[p2].append(edge_id)
+
+    # Step 4: Chain edges together to form polygon(s), consuming each edge once
+    used = bytearray(len(boundary_edges))
+    next_unused = 0
     polygons = []
 
     # May need to build multiple polygons (disconnected components)
-    while len(visited) < len(boundary_edges):
+    while True:
         # Find unvisited edge
-        start_point = None
-        for edge in boundary_edges:
-            if edge not in visited:
-                start_point = edge[0]
-                break
+        while next_unused < len(boundary_edges) and used[next_unused]:
+            next_unused += 1
 
-        if start_point is None:
+        if next_unused == len(boundary_edges):
             break
 
         # Trace polygon from start_point
+        start_point = boundary_edges[next_unused][0]
         current_point = start_point
-        polygon = [list(current_point)]
-        path_edges = []
+        polygon = [list(vertices[current_point])]
 
-        for _ in range(len(boundary_edges) + 1):  # Safety limit
-            if current_point not in adjacency:
-                break
+        while True:
+            # Find next unvisited edge, discarding ones used from the other end
+            edges_here = neighbors[current_point]
+            while edges_here and used[edges_here[0]]:
+                edges_here.popleft()
 
-            # Find next unvisited edge
-            next_point = None
-            for candidate in adjacency[current_point]:
-                edge_fwd = (current_point, candidate)
-                edge_rev = (candidate, current_point)
-
-                # Check if this edge hasn't been used
-                if edge_fwd not in visited and edge_rev not in visited:
-                    # Check if edge exists in original boundary
-                    if edge_fwd in edge_objects or edge_rev in edge_objects:
-                        next_point = candidate
-                        # Mark edge as visited
-                        if edge_fwd in edge_objects:
-                            visited.add(edge_fwd)
-                            path_edges.append(edge_fwd)
-                        else:
-                            visited.add(edge_rev)
-                            path_edges.append(edge_rev)
-                        break
-
-            if next_point is None:
+            if not edges_here:
                 # Dead end - try to close loop
                 break
 
+            edge_id = edges_here.popleft()
+            used[edge_id] = 1
+            p1, p2 = boundary_edges[edge_id]
+            next_point = p2 if p1 == current_point else p1
+
             # Check if we completed the loop
             if next_point == start_point:
                 break
 
-            polygon.append(list(next_point))
+            polygon.append(list(vertices[next_point]))
             current_point = next_point
 
         print(f"  Found polygon component with {len(polygon)} points")
@@ -162,8 +150,7 @@ def test_baltic_union():
 
     # Load Natural Earth data
     ne_path = os.path.join(data_dir, 'ne_110m_admin_0_countries.geojson')
-    with open(ne_path, 'r') as f:
-        data = json.load(f)
+    data = load_json(ne_path)
 
     # All countries bordering the Baltic Sea (including Eastern Flank mission countries)
     baltic_neighbors = ['Sweden', 'Finland', 'Russia', 'Poland', 'Germany', 'Denmark',
@@ -194,8 +181,7 @@ def test_baltic_union():
         }
 
         output_path = os.path.join(data_dir, 'baltic_border_union.geojson')
-        with open(output_path, 'w') as f:
-            json.dump(result, f, indent=2)
+        dump_json(result, output_path)
 
         print(f"\nSaved to: {output_path}")
         print(f"Components: {len(union_polygon)}")
@@ -3,142 +3,677 @@
 Polygon triangulation using ear clipping algorithm.
 
 Converts a simple polygon (no holes, no self-intersections) into triangles.
-Note: quick and simple, not optimal!
+Port of Mapbox's earcut: the ring is kept as a doubly linked list so
+clipping an ear is O(1), and for larger polygons vertices are also linked
+in z-order (Morton curve) so the ear containment test only checks points
+near the candidate ear, as one vectorized NumPy test over a z-sorted window.
+
+The orientation and containment predicates run on the vertices snapped to
+a 30-bit integer grid: every cross product then fits in an int64 and is
+exact, so collinearity and sign tests carry no rounding error.
 
 OUTPUT: data/baltic_border_union.geojson, test-data/union_triangulated.geojson
 """
-import json
 import os
-from .geometry import cross_product_2d, point_in_triangle, calculate_triangle_area, calculate_polygon_area
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ._jsonio import load_json, dump_feature_collection
+from .geometry import _as_coords
+
+try:
+    from ._triangulate_numba import earcut_into as _earcut_nb
+except ImportError:
+    _earcut_nb = None
+
+# Smallest z window that is tested with NumPy instead of a Python loop
+_VECTORIZE_MIN_WINDOW = 64
+
+# Vertices are snapped to a grid of 2**GRID_BITS cells per side; the
+# z-order curve uses the top 15 bits of each grid coordinate.
+GRID_BITS = 30
+_Z_SHIFT = GRID_BITS - 15  # keep in sync with _triangulate_numba._Z_SHIFT
+
+
+class _Workspace:
+    """
+    Node and triangle buffers for the numba kernel, reused across calls.
+
+    Buffers grow to the next power of two of the largest capacity asked
+    for, so triangulating many components only allocates on the first few
+    calls. Not thread-safe: there is one instance per process.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.nodes = None      # (8, size) int64: x, y, ids, prev, next, z, prev_z, next_z
+        self.reflex = None     # (size,) bool
+        self.triangles = None  # (size, 3) int64
+
+    def reserve(self, capacity):
+        """Grow the buffers to hold at least capacity nodes; returns self."""
+        if capacity > self.size:
+            size = 1 << (capacity - 1).bit_length()
+            self.nodes = np.empty((8, size), dtype=np.int64)
+            self.reflex = np.empty(size, dtype=np.bool_)
+            self.triangles = np.empty((size, 3), dtype=np.int64)
+            self.size = size
+        return self
+
+
+_WS = _Workspace()
+
+
+class Node:
+    """Vertex in the doubly linked ring (prev/next)."""
+
+    __slots__ = ('i', 'x', 'y', 'prev', 'next', 'z', 'removed')
+
+    def __init__(self, i, x, y):
+        self.i = i  # index of the vertex in the input polygon
+        self.x = x
+        self.y = y
+        self.prev = None
+        self.next = None
+        self.z = None
+        self.removed = False
+
+
+def _insert_node(i, x, y, last):
+    """Create a node and link it in after last."""
+    p = Node(i, x, y)
+
+    if last is None:
+        p.prev = p
+        p.next = p
+    else:
+        p.next = last.next
+        p.prev = last
+        last.next.prev = p
+        last.next = p
+
+    return p
+
+
+def _remove_node(p):
+    """Unlink a node from the ring."""
+    p.next.prev = p.prev
+    p.prev.next = p.next
+    p.removed = True
+
+
+def _area(p, q, r):
+    """Signed area of triangle pqr; negative when p, q, r turn counter-clockwise."""
+    return (q.y - p.y) * (r.x - q.x) - (q.x - p.x) * (r.y - q.y)
+
+
+def _equals(p1, p2):
+    return p1.x == p2.x and p1.y == p2.y
+
+
+def _sign(num):
+    return 1 if num > 0 else -1 if num < 0 else 0
+
+
+def _on_segment(p, q, r):
+    """Check if collinear point q lies on segment pr."""
+    return (min(p.x, r.x) <= q.x <= max(p.x, r.x) and
+            min(p.y, r.y) <= q.y <= max(p.y, r.y))
+
+
+def _intersects(p1, q1, p2, q2):
+    """Check if segment p1-q1 intersects segment p2-q2."""
+    o1 = _sign(_area(p1, q1, p2))
+    o2 = _sign(_area(p1, q1, q2))
+    o3 = _sign(_area(p2, q2, p1))
+    o4 = _sign(_area(p2, q2, q1))
+
+    if o1 != o2 and o3 != o4:
+        return True
+
+    if o1 == 0 and _on_segment(p1, p2, q1):
+        return True
+    if o2 == 0 and _on_segment(p1, q2, q1):
+        return True
+    if o3 == 0 and _on_segment(p2, p1, q2):
+        return True
+    if o4 == 0 and _on_segment(p2, q1, q2):
+        return True
+
+    return False
+
+
+def _point_in_triangle(ax, ay, bx, by, cx, cy, px, py):
+    """Check if point p lies inside (or on) the counter-clockwise triangle abc."""
+    # Vertex offsets from p, shared by the three edge tests
+    dax = ax - px
+    day = ay - py
+    dbx = bx - px
+    dby = by - py
+    dcx = cx - px
+    dcy = cy - py
+
+    return (dcx * day >= dax * dcy and
+            dax * dby >= dbx * day and
+            dbx * dcy >= dcx * dby)
+
+
+def _z_order(x, y):
+    """Morton code of a grid point, from its coordinates reduced to 15 bits."""
+    x >>= _Z_SHIFT
+    y >>= _Z_SHIFT
+
+    x = (x | (x << 8)) & 0x00FF00FF
+    x = (x | (x << 4)) & 0x0F0F0F0F
+    x = (x | (x << 2)) & 0x33333333
+    x = (x | (x << 1)) & 0x55555555
 
+    y = (y | (y << 8)) & 0x00FF00FF
+    y = (y | (y << 4)) & 0x0F0F0F0F
+    y = (y | (y << 2)) & 0x33333333
+    y = (y | (y << 1)) & 0x55555555
 
-def is_ear(prev_idx, curr_idx, next_idx, polygon, remaining_indices):
+    return x | (y << 1)
+
+
+def _snap_to_grid(poly):
+    """
+    Map polygon vertices onto the integer grid used by the predicates.
+
+    The bounding box is scaled uniformly so its longer side spans
+    [0, 2**GRID_BITS - 1]; coordinates are rounded to the nearest cell.
+
+    Args:
+        poly: (N, 2) float64 array
+
+    Returns:
+        (N, 2) int64 array
+    """
+    min_xy = poly.min(axis=0)
+    size = float((poly.max(axis=0) - min_xy).max())
+    scale = ((1 << GRID_BITS) - 1) / size if size > 0 else 0.0
+
+    return np.rint((poly - min_xy) * scale).astype(np.int64)
+
+
+def _linked_list(grid):
+    """Build the circular doubly linked ring for a counter-clockwise polygon."""
+    last = None
+    for i, (x, y) in enumerate(grid.tolist()):
+        last = _insert_node(i, x, y, last)
+
+    if last is not None and _equals(last, last.next):
+        _remove_node(last)
+        last = last.next
+
+    return last
+
+
+def _filter_points(start, end=None):
+    """Remove duplicate and collinear points from the ring."""
+    if start is None:
+        return start
+    if end is None:
+        end = start
+
+    p = start
+    while True:
+        again = False
+
+        if _equals(p, p.next) or _area(p.prev, p, p.next) == 0:
+            _remove_node(p)
+            p = end = p.prev
+            if p is p.next:
+                break
+            again = True
+        else:
+            p = p.next
+
+        if not again and p is end:
+            break
+
+    return end
+
+
+def _index_curve(start):
     """
-    Check if vertex at curr_idx forms an ear.
+    Compute z-order codes and index the ring by z.
+
+    Returns:
+        (nodes, z, x, y): ring nodes sorted by z code, their z codes (list,
+        for bisect) and their coordinates as NumPy arrays in the same order
+    """
+    nodes = []
+    p = start
+    while True:
+        if p.z is None:
+            p.z = _z_order(p.x, p.y)
+        nodes.append(p)
+        p = p.next
+        if p is start:
+            break
+
+    nodes.sort(key=lambda node: node.z)
+    z = [node.z for node in nodes]
+    x = np.fromiter((node.x for node in nodes), dtype=np.int64, count=len(nodes))
+    y = np.fromiter((node.y for node in nodes), dtype=np.int64, count=len(nodes))
+
+    return nodes, z, x, y
+
+
+def is_ear(ear):
+    """
+    Check if node ear forms an ear.
 
     An ear is a triangle formed by three consecutive vertices where:
     1. The triangle is counter-clockwise (convex)
-    2. No other vertices of the polygon are inside the triangle
+    2. No reflex vertex of the polygon is inside the triangle
 
     Args:
-        prev_idx, curr_idx, next_idx: Indices in remaining_indices list
-        polygon: Original polygon coordinates
-        remaining_indices: List of indices still in polygon
+        ear: Node of the remaining ring
 
     Returns:
-        True if curr forms an ear
+        True if ear can be clipped
     """
-    # Get actual vertex indices
-    i_prev = remaining_indices[prev_idx]
-    i_curr = remaining_indices[curr_idx]
-    i_next = remaining_indices[next_idx]
-
-    # Get coordinates
-    prev = polygon[i_prev]
-    curr = polygon[i_curr]
-    next_p = polygon[i_next]
+    a = ear.prev
+    b = ear
+    c = ear.next
 
-    # Check if triangle is convex (counter-clockwise)
-    cross = cross_product_2d(prev, curr, next_p)
-    if cross <= 0:  # Clockwise or collinear - not an ear
+    if _area(a, b, c) >= 0:  # Clockwise or collinear - not an ear
         return False
 
+    ax, ay, bx, by, cx, cy = a.x, a.y, b.x, b.y, c.x, c.y
+
+    # Triangle bounding box
+    x0 = min(ax, bx, cx)
+    y0 = min(ay, by, cy)
+    x1 = max(ax, bx, cx)
+    y1 = max(ay, by, cy)
+
     # Check if any other vertex is inside this triangle
-    for idx in remaining_indices:
-        # Skip the three vertices forming the triangle
-        if idx == i_prev or idx == i_curr or idx == i_next:
-            continue
+    p = c.next
+    while p is not a:
+        if (x0 <= p.x <= x1 and y0 <= p.y <= y1 and
+                _point_in_triangle(ax, ay, bx, by, cx, cy, p.x, p.y) and
+                _area(p.prev, p, p.next) >= 0):
+            return False
+        p = p.next
+
+    return True
+
+
+def is_ear_hashed(ear, z_index):
+    """
+    Same as is_ear, but only tests points whose z-order code lies within
+    the z range of the triangle's bounding box.
+
+    The window is found with a binary search on the z-sorted index from
+    _index_curve, and bbox plus point-in-triangle are evaluated for the
+    whole window at once; only the (few) hits are checked for being a
+    live reflex vertex.
+    """
+    a = ear.prev
+    b = ear
+    c = ear.next
 
-        point = polygon[idx]
-        if point_in_triangle(point, prev, curr, next_p):
+    if _area(a, b, c) >= 0:  # Clockwise or collinear - not an ear
+        return False
+
+    ax, ay, bx, by, cx, cy = a.x, a.y, b.x, b.y, c.x, c.y
+
+    # Triangle bounding box
+    x0 = min(ax, bx, cx)
+    y0 = min(ay, by, cy)
+    x1 = max(ax, bx, cx)
+    y1 = max(ay, by, cy)
+
+    # z-order range for the current triangle bbox
+    min_z = _z_order(x0, y0)
+    max_z = _z_order(x1, y1)
+
+    nodes, z, x, y = z_index
+    lo = bisect_left(z, min_z)
+    hi = bisect_right(z, max_z)
+
+    # NumPy call overhead outweighs the loop for small windows
+    if hi - lo < _VECTORIZE_MIN_WINDOW:
+        for k in range(lo, hi):
+            p = nodes[k]
+            if (x0 <= p.x <= x1 and y0 <= p.y <= y1 and not p.removed and
+                    p is not a and p is not b and p is not c and
+                    _point_in_triangle(ax, ay, bx, by, cx, cy, p.x, p.y) and
+                    _area(p.prev, p, p.next) >= 0):
+                return False
+        return True
+
+    # The z window is wider than the bbox; narrow it down first
+    px = x[lo:hi]
+    py = y[lo:hi]
+    candidates = np.flatnonzero((px >= x0) & (px <= x1) & (py >= y0) & (py <= y1))
+    if candidates.size == 0:
+        return True
+
+    # Same edge tests as _point_in_triangle, on shared vertex offsets
+    px = px[candidates]
+    py = py[candidates]
+    dax = ax - px
+    day = ay - py
+    dbx = bx - px
+    dby = by - py
+    dcx = cx - px
+    dcy = cy - py
+    inside = (dcx * day >= dax * dcy) & (dax * dby >= dbx * day) & (dbx * dcy >= dcx * dby)
+
+    for k in candidates[inside]:
+        p = nodes[lo + k]
+        if (not p.removed and p is not a and p is not b and p is not c and
+                _area(p.prev, p, p.next) >= 0):
             return False
 
     return True
 
 
-def triangulate_polygon(polygon):
+def _locally_inside(a, b):
+    """Check if a polygon diagonal a-b is locally inside the polygon."""
+    if _area(a.prev, a, a.next) < 0:
+        return _area(a, b, a.next) >= 0 and _area(a, a.prev, b) >= 0
+    return _area(a, b, a.prev) < 0 or _area(a, a.next, b) < 0
+
+
+def _middle_inside(a, b):
+    """Check if the middle point of a polygon diagonal a-b is inside the polygon."""
+    p = a
+    inside = False
+    px = (a.x + b.x) / 2
+    py = (a.y + b.y) / 2
+
+    while True:
+        if (((p.y > py) != (p.next.y > py)) and p.next.y != p.y and
+                px < (p.next.x - p.x) * (py - p.y) / (p.next.y - p.y) + p.x):
+            inside = not inside
+        p = p.next
+        if p is a:
+            break
+
+    return inside
+
+
+def _intersects_polygon(a, b):
+    """Check if a polygon diagonal a-b intersects any polygon segment."""
+    p = a
+    while True:
+        if (p.i != a.i and p.next.i != a.i and p.i != b.i and p.next.i != b.i and
+                _intersects(p, p.next, a, b)):
+            return True
+        p = p.next
+        if p is a:
+            return False
+
+
+def _is_valid_diagonal(a, b):
+    """Check if a diagonal between a and b splits the polygon into two valid ones."""
+    return (a.next.i != b.i and a.prev.i != b.i and not _intersects_polygon(a, b) and
+            ((_locally_inside(a, b) and _locally_inside(b, a) and _middle_inside(a, b) and
+              (_area(a.prev, a, b.prev) != 0 or _area(a, b.prev, b) != 0)) or
+             (_equals(a, b) and _area(a.prev, a, a.next) > 0 and
+              _area(b.prev, b, b.next) > 0)))
+
+
+def _split_polygon(a, b):
     """
-    Triangulate a simple polygon using ear clipping algorithm.
+    Link a and b with a diagonal, splitting the ring in two.
+
+    Returns a node of the second ring; a stays in the first.
+    """
+    a2 = Node(a.i, a.x, a.y)
+    b2 = Node(b.i, b.x, b.y)
+    an = a.next
+    bp = b.prev
+
+    a.next = b
+    b.prev = a
+
+    a2.next = an
+    an.prev = a2
+
+    a2.prev = b2
+    b2.next = a2
+
+    b2.prev = bp
+    bp.next = b2
+
+    return b2
+
+
+def _cure_local_intersections(start, triangles):
+    """Clip away small self-intersections (a-p-p.next-b crossing) left after filtering."""
+    p = start
+    while True:
+        a = p.prev
+        b = p.next.next
+
+        if (not _equals(a, b) and _intersects(a, p, p.next, b) and
+                _locally_inside(a, b) and _locally_inside(b, a)):
+            triangles.append((a.i, p.i, b.i))
+
+            # Remove two nodes involved
+            _remove_node(p)
+            _remove_node(p.next)
+
+            p = start = b
+
+        p = p.next
+        if p is start:
+            break
+
+    return _filter_points(p)
+
+
+def _split_earcut(start, triangles, hashed):
+    """Split the ring along a valid diagonal and triangulate both halves."""
+    a = start
+    while True:
+        b = a.next.next
+        while b is not a.prev:
+            if a.i != b.i and _is_valid_diagonal(a, b):
+                c = _split_polygon(a, b)
+
+                # Filter collinear points around the cuts
+                a = _filter_points(a, a.next)
+                c = _filter_points(c, c.next)
+
+                _earcut_linked(a, triangles, hashed, 0)
+                _earcut_linked(c, triangles, hashed, 0)
+                return
+            b = b.next
+
+        a = a.next
+        if a is start:
+            return
+
+
+def _earcut_linked(ear, triangles, hashed, recovery_pass, z_index=None):
+    """
+    Main ear slicing loop over the linked ring.
+
+    When a full rotation finds no ear, recover in stages: filter collinear
+    points, then cure local self-intersections, then split the ring along
+    a valid diagonal.
+
+    With hashed set, each ring is indexed in z-order for the ear test.
+    """
+    if ear is None:
+        return
+
+    # Index polygon nodes in z-order
+    if recovery_pass == 0 and hashed:
+        z_index = _index_curve(ear)
+
+    stop = ear
+    clipped = 0
+
+    # Iterate through ears, slicing them one by one
+    while ear.prev is not ear.next:
+        prev = ear.prev
+        next_node = ear.next
+
+        if is_ear_hashed(ear, z_index) if z_index is not None else is_ear(ear):
+            # Found an ear! Cut it off
+            triangles.append((prev.i, ear.i, next_node.i))
+            _remove_node(ear)
+
+            # Skipping the next vertex leads to less sliver triangles
+            ear = next_node.next
+            stop = next_node.next
+
+            # Drop clipped nodes from the z index once they make up half of it
+            if z_index is not None:
+                clipped += 1
+                if 2 * clipped > len(z_index[0]):
+                    z_index = _index_curve(ear)
+                    clipped = 0
+            continue
+
+        ear = next_node
+
+        # If we looped through the whole remaining polygon and can't find any more ears
+        if ear is stop:
+            if recovery_pass == 0:
+                # Try filtering points and slicing again
+                _earcut_linked(_filter_points(ear), triangles, hashed, 1, z_index)
+            elif recovery_pass == 1:
+                # If this didn't work, try curing all small self-intersections locally
+                ear = _cure_local_intersections(_filter_points(ear), triangles)
+                _earcut_linked(ear, triangles, hashed, 2, z_index)
+            else:
+                # As a last resort, try splitting the remaining polygon into two
+                _split_earcut(ear, triangles, hashed)
+            break
+
+
+def _triangle_indices(polygon):
+    """
+    Run earcut on a ring and return its triangles as vertex indices.
 
     Args:
-        polygon: List of [x, y] or [lon, lat] coordinates forming a simple polygon
-                Must be counter-clockwise ordered
+        polygon: Ring of [x, y] coordinates, optionally closed
 
     Returns:
-        List of triangles, where each triangle is [[x1,y1], [x2,y2], [x3,y3]]
+        (poly, indices): poly is the (N, 2) float64 ring the indices refer
+        to (closing point dropped, counter-clockwise), indices an (M, 3)
+        int64 array with one row per triangle
     """
-    # Make a copy and remove duplicate last point if present
-    poly = [list(p) for p in polygon]
-    if poly[0] == poly[-1]:
+    # Work on a float64 array; drop duplicate last point if present
+    poly = _as_coords(polygon, dtype=np.float64)
+    if len(poly) > 1 and np.array_equal(poly[0], poly[-1]):
         poly = poly[:-1]
 
     n = len(poly)
     if n < 3:
-        return []
+        return poly, np.empty((0, 3), dtype=np.int64)
 
     # If only 3 vertices, it's already a triangle
     if n == 3:
-        return [poly]
+        return poly, np.array([[0, 1, 2]], dtype=np.int64)
 
-    # Check if polygon is counter-clockwise, reverse if clockwise
-    area = 0
-    for i in range(n):
-        j = (i + 1) % n
-        area += poly[i][0] * poly[j][1]
-        area -= poly[j][0] * poly[i][1]
+    # Check if polygon is counter-clockwise (shoelace), reverse if clockwise.
+    # Slicing views instead of np.roll keeps this free of array copies.
+    x = poly[:, 0]
+    y = poly[:, 1]
+    area = (np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]) +
+            x[-1] * y[0] - x[0] * y[-1])
 
-    if area < 0:  # Clockwise, reverse it
+    if area < 0:  # Clockwise, reverse it (a view; the grid below is a fresh array)
         poly = poly[::-1]
         print("  Reversed polygon to counter-clockwise")
 
-    triangles = []
-    remaining_indices = list(range(n))
+    grid = _snap_to_grid(poly)
 
-    # Ear clipping loop
-    iterations = 0
-    max_iterations = 2 * n  # Safety limit
+    # z-order hashing only pays off for larger polygons
+    hashed = n > 80
 
-    while len(remaining_indices) > 3 and iterations < max_iterations:
-        iterations += 1
+    if _earcut_nb is not None:
+        ws = _WS.reserve(3 * n)
+        count = _earcut_nb(grid, hashed, *ws.nodes, ws.reflex, ws.triangles)
+        return poly, ws.triangles[:count]
 
-        # Try to find an ear
-        ear_found = False
-        for i in range(len(remaining_indices)):
-            prev_idx = (i - 1) % len(remaining_indices)
-            curr_idx = i
-            next_idx = (i + 1) % len(remaining_indices)
+    outer_node = _linked_list(grid)
+    if outer_node is None or outer_node.next is outer_node.prev:
+        return poly, np.empty((0, 3), dtype=np.int64)
 
-            if is_ear(prev_idx, curr_idx, next_idx, poly, remaining_indices):
-                # Found an ear! Cut it off
-                i_prev = remaining_indices[prev_idx]
-                i_curr = remaining_indices[curr_idx]
-                i_next = remaining_indices[next_idx]
+    triangle_indices = []
+    _earcut_linked(outer_node, triangle_indices, hashed, 0)
+    return poly, np.array(triangle_indices, dtype=np.int64).reshape(-1, 3)
 
-                triangle = [poly[i_prev], poly[i_curr], poly[i_next]]
-                triangles.append(triangle)
 
-                # Remove the ear vertex
-                remaining_indices.pop(curr_idx)
-                ear_found = True
-                break
+def _triangles_area(poly, indices):
+    """Summed area of the triangles poly[indices], in one vectorized pass."""
+    a = poly[indices[:, 0]]
+    b = poly[indices[:, 1]]
+    c = poly[indices[:, 2]]
+    cross = ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) -
+             (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+    return 0.5 * float(np.abs(cross).sum())
 
-        if not ear_found:
-            print(f"  Warning: No ear found after {iterations} iterations")
-            print(f"  Remaining vertices: {len(remaining_indices)}")
-            break
 
-    # Add final triangle
-    if len(remaining_indices) == 3:
-        final_triangle = [poly[remaining_indices[0]],
-                         poly[remaining_indices[1]],
-                         poly[remaining_indices[2]]]
-        triangles.append(final_triangle)
+def triangulate_polygon(polygon, with_area=False):
+    """
+    Triangulate a simple polygon using ear clipping algorithm.
+
+    Args:
+        polygon: List of [x, y] or [lon, lat] coordinates forming a simple polygon
+                Must be counter-clockwise ordered
+        with_area: Also return the summed area of the triangles, computed
+                   from the triangle indices before they become lists
+
+    Returns:
+        List of triangles, where each triangle is [[x1,y1], [x2,y2], [x3,y3]];
+        (triangles, total_area) when with_area is set
+    """
+    poly, indices = _triangle_indices(polygon)
+
+    points = poly.tolist()
+    triangles = [[points[a], points[b], points[c]] for a, b, c in indices.tolist()]
 
+    if with_area:
+        return triangles, _triangles_area(poly, indices)
     return triangles
 
 
-def test_triangulation():
-    """Test triangulation on the union of Baltic-bordering countries."""
+def triangulate_components(components, max_workers=None, with_area=False):
+    """
+    Triangulate the outer ring of every component of a MultiPolygon.
+
+    Components are independent, so they are spread over a process pool;
+    the pure Python fallback holds the GIL, so threads would not help.
+
+    Args:
+        components: MultiPolygon coordinates, a list of [outer, *holes] rings
+        max_workers: Pool size (None for one per CPU); 1 runs in-process
+        with_area: Return (triangles, total_area) per component
+
+    Returns:
+        List with the result of triangulate_polygon for each component,
+        in input order
+    """
+    rings = [c[0] for c in components]
+    if max_workers == 1 or len(rings) < 2:
+        return [triangulate_polygon(ring, with_area) for ring in rings]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(triangulate_polygon, rings, [with_area] * len(rings)))
+
+
+def test_triangulation(verify=False, all_components=False):
+    """
+    Test triangulation on the union of Baltic-bordering countries.
+
+    Args:
+        verify: Also check the triangle count against n - 2 and report the
+                summed triangle area (an extra pass over all triangles)
+        all_components: Triangulate every component in parallel instead of
+                        only the largest one
+    """
 
     # Get paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -147,52 +682,68 @@ def test_triangulation():
 
     # Load Baltic border union polygon (from main data)
     union_path = os.path.join(data_dir, 'baltic_border_union.geojson')
-    with open(union_path, 'r') as f:
-        union_data = json.load(f)
+    union_data = load_json(union_path)
 
     # Get all components
     components = union_data['geometry']['coordinates']
 
-    # Find largest component (main landmass)
-    largest = max(components, key=lambda c: len(c[0]))
-    polygon = largest[0]  # Outer ring
-
-    print(f"Baltic countries union (largest component): {len(polygon)} points")
-    print(f"Triangulating...")
-
-    triangles = triangulate_polygon(polygon)
+    if all_components:
+        rings = [c[0] for c in components]
+        num_points = sum(len(ring) for ring in rings)
+        expected = sum(len(ring) - 2 for ring in rings)
+
+        print(f"Baltic countries union ({len(rings)} components): {num_points} points")
+        print(f"Triangulating...")
+
+        results = triangulate_components(components, with_area=verify)
+        if verify:
+            triangles = [t for tris, _ in results for t in tris]
+            total_area = sum(area for _, area in results)
+        else:
+            triangles = [t for tris in results for t in tris]
+    else:
+        # Find largest component (main landmass)
+        largest = max(components, key=lambda c: len(c[0]))
+        polygon = largest[0]  # Outer ring
+        num_points = len(polygon)
+        expected = len(polygon) - 2
+
+        print(f"Baltic countries union (largest component): {len(polygon)} points")
+        print(f"Triangulating...")
+
+        if verify:
+            triangles, total_area = triangulate_polygon(polygon, with_area=True)
+        else:
+            triangles = triangulate_polygon(polygon)
 
     print(f"\n Triangulation complete!")
-    print(f"  Input: {len(polygon)} vertices")
+    print(f"  Input: {num_points} vertices")
     print(f"  Output: {len(triangles)} triangles")
-    print(f"  Expected: {len(polygon) - 2} triangles (Euler's formula)")
-
-    if len(triangles) < len(polygon) - 2:
-        print(f"    Missing {len(polygon) - 2 - len(triangles)} triangles")
-
-    # Calculate area (sum of triangle areas)
-    total_area = sum(calculate_triangle_area(t) for t in triangles)
-    print(f"\nPolygon area: {total_area:.4f} square degrees")
-
-    # Save triangulation result
-    output_data = {
-        "type": "FeatureCollection",
-        "features": [
-            {
-                "type": "Feature",
-                "properties": {"triangle_id": i},
-                "geometry": {
-                    "type": "Polygon",
-                    "coordinates": [triangle + [triangle[0]]]  # Close the triangle
-                }
+
+    if verify:
+        print(f"  Expected: {expected} triangles (Euler's formula)")
+
+        if len(triangles) < expected:
+            print(f"    Missing {expected - len(triangles)} triangles")
+
+        # Summed triangle areas, computed alongside the triangulation
+        print(f"\nPolygon area: {total_area:.4f} square degrees")
+
+    # Save triangulation result, streaming one feature at a time
+    features = (
+        {
+            "type": "Feature",
+            "properties": {"triangle_id": i},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [triangle + [triangle[0]]]  # Close the triangle
             }
-            for i, triangle in enumerate(triangles)
-        ]
-    }
+        }
+        for i, triangle in enumerate(triangles)
+    )
 
     output_path = os.path.join(test_data_dir, 'union_triangulated.geojson')
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    dump_feature_collection(features, output_path)
 
     print(f"\nTriangulation saved to: {output_path}")
     print("You can visualize this in QGIS or geojson.io")
@@ -18,18 +18,295 @@ Mission Context (2024-2025):
 INPUT: data/geojson/ne_110m_admin_0_countries.geojson
 OUTPUT: maps/african_missions_map.html
 """
-import json
+import functools
 import folium
 import os
+from map_common import load_geojson
+from utils.map_making._jsonio import dumps_json
+
+try:
+    import jinja2
+except ImportError:  # jinja2 not installed, render through folium
+    jinja2 = None
+
+TEMPLATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'templates', 'african_map.html.j2')
 
 
 def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson'):
-    """Load Natural Earth countries GeoJSON from cache."""
-    with open(cache_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """
+    Load Natural Earth countries GeoJSON from cache.
+
+    The parse is memoized by map_common.load_geojson, shared with the other
+    map scripts, so repeated calls only re-read it after it changed. Treat
+    the result as read-only.
+    """
+    return load_geojson(cache_file)
+
+
+@functools.lru_cache(maxsize=4)
+def _index_by_name(cache_file, mtime):
+    """Map NAME -> feature for a parsed GeoJSON file."""
+    geojson_data = load_geojson(cache_file)
+    return {f['properties'].get('NAME'): f for f in geojson_data['features']}
+
+
+def get_countries_by_name(cache_file='data/geojson/ne_110m_admin_0_countries.geojson'):
+    """Load Natural Earth countries as a read-only {NAME: feature} dict."""
+    return _index_by_name(cache_file, os.path.getmtime(cache_file))
+
+
+# Countries with Belgian military presence
+AFRICAN_MISSIONS = {
+    'Dem. Rep. Congo': {
+        'color': '#ff6666',
+        'role': 'EPF mission - Equipment support & training at Camp Lwama (Kindu)',
+        'personnel': '~10 military',
+        'mission': 'European Peace Facility'
+    },
+    'Benin': {
+        'color': '#66cc66',
+        'role': 'Bilateral partnership - Training National Guard, maritime security',
+        'personnel': 'Training missions',
+        'mission': 'Security cooperation (25+ years)'
+    },
+    'Mali': {
+        'color': '#ffcc66',
+        'role': 'Embassy security detachment (DAS) - Diplomatic protection',
+        'personnel': 'Security detachment',
+        'mission': 'Diplomatic protection'
+    },
+    'Burkina Faso': {
+        'color': '#ffcc66',
+        'role': 'Embassy security detachment (DAS) - Diplomatic protection',
+        'personnel': 'Security detachment',
+        'mission': 'Diplomatic protection'
+    },
+    'Niger': {
+        'color': '#ffcc66',
+        'role': 'Embassy security detachment (DAS) - Diplomatic protection',
+        'personnel': 'Security detachment',
+        'mission': 'Diplomatic protection'
+    },
+}
+
+# Belgian embassies with security detachments
+EMBASSIES = [
+    {
+        'name': 'Belgian Embassy Kinshasa',
+        'coords': [-4.3276, 15.3136],
+        'country': 'DRC',
+        'role': 'Embassy with security support',
+        'color': '#cc0000',
+        'icon': 'home'
+    },
+    {
+        'name': 'Belgian Embassy Bamako',
+        'coords': [12.6392, -8.0029],
+        'country': 'Mali',
+        'role': 'Embassy with DAS security detachment',
+        'color': '#cc0000',
+        'icon': 'home'
+    },
+    {
+        'name': 'Belgian Embassy Ouagadougou',
+        'coords': [12.3714, -1.5197],
+        'country': 'Burkina Faso',
+        'role': 'Embassy with DAS security detachment',
+        'color': '#cc0000',
+        'icon': 'home'
+    },
+    {
+        'name': 'Belgian Embassy Niamey',
+        'coords': [13.5116, 2.1254],
+        'country': 'Niger',
+        'role': 'Embassy with DAS security detachment',
+        'color': '#cc0000',
+        'icon': 'home'
+    },
+]
+
+# Operational sites in DRC
+DRC_SITES = [
+    {
+        'name': 'Kindu',
+        'coords': [-2.9578, 25.9224],
+        'country': 'DRC (Maniema Province)',
+        'role': 'EPF project oversight center (through Dec 2027)',
+        'color': '#0066cc',
+        'icon': 'plane'
+    },
+    {
+        'name': 'Camp Lwama',
+        'coords': [-2.95, 25.95],  # Near Kindu
+        'country': 'DRC (near Kindu)',
+        'role': '31 Brigade equipment & infrastructure support',
+        'color': '#0066cc',
+        'icon': 'plane'
+    },
+]
+
+# Mission overview annotation box
+OVERVIEW_HTML = '''
+<div style="position: fixed;
+            top: 80px; right: 15px; width: 320px;
+            background-color: white; border:2px solid #cc6600; z-index:9999;
+            font-size:11px; padding: 12px; line-height: 1.5;">
+<p style="margin: 0 0 8px 0; font-weight: bold; color: #cc6600;">Belgian Missions in Africa</p>
+<p style="margin: 4px 0; font-size: 10px;">
+    <b style="color: #ff6666;">DRC:</b> European Peace Facility (EPF)<br>
+    → Equipment & training for 31 Brigade<br>
+    → Camp Lwama (Kindu) operations<br>
+    → Through December 2027<br><br>
+
+    <b style="color: #66cc66;">Benin:</b> Bilateral Partnership<br>
+    → 25+ years of cooperation<br>
+    → National Guard training<br>
+    → Maritime security (Gulf of Guinea)<br><br>
+
+    <b style="color: #ffcc66;">Mali, Burkina Faso, Niger:</b><br>
+    → Embassy security detachments (DAS)<br>
+    → Diplomatic protection<br>
+    → Evacuation coordination<br><br>
+
+    <b>Sahel:</b> 3D Approach (Diplomacy, Development, Defense)
+</p>
+</div>
+'''
+
+# Legend
+LEGEND_HTML = '''
+<div style="position: fixed;
+            bottom: 50px; right: 15px; width: 280px;
+            background-color: white; border:2px solid grey; z-index:9999;
+            font-size:11px; padding: 12px; line-height: 1.6;">
+<p style="margin: 0 0 8px 0; font-weight: bold;">Mission Elements</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #ff6666; padding: 2px 8px; border-radius: 3px;">■</span>
+    <b>DRC</b> - EPF equipment & training
+</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #66cc66; padding: 2px 8px; border-radius: 3px;">■</span>
+    <b>Benin</b> - Bilateral partnership
+</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #ffcc66; padding: 2px 8px; border-radius: 3px;">■</span>
+    <b>Sahel</b> - Embassy security (DAS)
+</p>
+<p style="margin: 4px 0;">
+    <i class="fa fa-home" style="color: red;"></i>
+    Belgian Embassies
+</p>
+<p style="margin: 4px 0;">
+    <i class="fa fa-plane" style="color: blue;"></i>
+    Operational sites (DRC)
+</p>
+<p style="margin: 4px 0;">
+    <span style="border: 2px dashed #0066cc; padding: 2px 6px;">---</span>
+    Gulf of Guinea (piracy)
+</p>
+<p style="margin: 4px 0;">
+    <span style="border: 2px dashed #cc6600; padding: 2px 6px;">---</span>
+    Sahel (terrorism)
+</p>
+<p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
+    Data source: Belgian Defence<br>
+    (mil.be/nl/onze-missies/missies-in-afrika)
+</p>
+</div>
+'''
+
+
+# Hover style shared by all mission countries
+HIGHLIGHT_STYLE = {'fillOpacity': 0.8, 'weight': 3}
+
+
+def _country_style(color):
+    """Static style dict for a mission country filled with color."""
+    return {'fillColor': color, 'color': '#333333', 'weight': 2, 'fillOpacity': 0.6}
+
+
+def _feature_style(feature):
+    """folium style_function returning the style stored in the feature."""
+    return feature['properties']['_style']
+
+
+def _feature_highlight(feature):
+    """folium highlight_function shared by all mission countries."""
+    return HIGHLIGHT_STYLE
+
+
+def _country_popup_html(country_name, info):
+    """Popup content for a mission country."""
+    return f"""
+            <div style="width: 280px; font-family: Arial, sans-serif;">
+                <h4 style="margin: 0 0 8px 0;">{country_name}</h4>
+                <p style="margin: 4px 0;"><b>Mission:</b> {info['mission']}</p>
+                <p style="margin: 4px 0;"><b>Personnel:</b> {info['personnel']}</p>
+                <p style="margin: 4px 0; font-size: 11px;">{info['role']}</p>
+            </div>
+            """
 
 
-def create_african_missions_map(output_file='maps/african_missions_map.html'):
+def _site_popup_html(site, width):
+    """Popup content for an embassy or operational site."""
+    return f"""
+        <div style="width: {width}px; font-family: Arial, sans-serif;">
+            <h4 style="margin: 0 0 8px 0;">{site['name']}</h4>
+            <p style="margin: 4px 0;"><b>Location:</b> {site['country']}</p>
+            <p style="margin: 4px 0;"><b>Role:</b> {site['role']}</p>
+        </div>
+        """
+
+
+def _missions_payload():
+    """
+    Collect the map data rendered by the Leaflet template.
+
+    Returns:
+        Dict with 'countries' (GeoJSON features carrying name, color and
+        popup) and 'markers' (embassies and DRC sites)
+    """
+    countries = get_countries_by_name()
+
+    features = []
+    for country_name, info in AFRICAN_MISSIONS.items():
+        feature = countries.get(country_name)
+        if feature is not None:
+            features.append({
+                'type': 'Feature',
+                'geometry': feature['geometry'],
+                'properties': {
+                    'name': country_name,
+                    'style': _country_style(info['color']),
+                    'popup': _country_popup_html(country_name, info)
+                }
+            })
+
+    markers = []
+    for embassy in EMBASSIES:
+        markers.append({
+            'name': embassy['name'],
+            'coords': embassy['coords'],
+            'icon': 'home',
+            'marker_color': 'red',
+            'popup': _site_popup_html(embassy, 220),
+            'max_width': 250
+        })
+    for site in DRC_SITES:
+        markers.append({
+            'name': site['name'],
+            'coords': site['coords'],
+            'icon': site['icon'],
+            'marker_color': 'blue',
+            'popup': _site_popup_html(site, 240),
+            'max_width': 260
+        })
+
+    return {'countries': features, 'markers': markers}
+
+
+def create_african_missions_map(output_file='maps/african_missions_map.html', use_folium=False):
     """
     Create detailed map of Belgian military missions in Africa.
 
@@ -39,7 +316,42 @@ def create_african_missions_map(output_file='maps/african_missions_map.html'):
     - Key operational sites in DRC
     - Gulf of Guinea (piracy threat zone)
     - Sahel region (terrorism threat zone)
+
+    The page is rendered in one pass from templates/african_map.html.j2,
+    with the map data embedded as JSON. Falls back to folium when jinja2 is
+    not installed or use_folium is set.
+
+    Args:
+        output_file: Path of the HTML file to write
+        use_folium: Build the map through folium instead of the template
+
+    Returns:
+        The rendered HTML as a str on the template path. On the folium path
+        (use_folium set, or jinja2 missing) the folium.Map instead, so pass
+        use_folium=True when a folium.Map is needed.
     """
+    if use_folium or jinja2 is None:
+        return _create_folium_map(output_file)
+
+    missions_json = dumps_json(_missions_payload())
+    # Keep popup markup from closing the inline <script> early
+    missions_json = missions_json.replace('</', '<\\/')
+
+    with open(TEMPLATE_FILE, encoding='utf-8') as f:
+        template = jinja2.Template(f.read())
+    html = template.render(missions_json=missions_json,
+                           highlight_json=dumps_json(HIGHLIGHT_STYLE),
+                           overview_html=OVERVIEW_HTML,
+                           legend_html=LEGEND_HTML)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f" African missions map saved to {output_file}")
+    return html
+
+
+def _create_folium_map(output_file):
+    """Build the African missions map through folium (see create_african_missions_map)."""
 
     # Center on West/Central Africa
     m = folium.Map(
@@ -48,159 +360,40 @@ def create_african_missions_map(output_file='maps/african_missions_map.html'):
         tiles='CartoDB positron'
     )
 
-    # Load Natural Earth data
-    geojson_data = get_country_geojson()
-
-    # Countries with Belgian military presence
-    african_missions = {
-        'Dem. Rep. Congo': {
-            'color': '#ff6666',
-            'role': 'EPF mission - Equipment support & training at Camp Lwama (Kindu)',
-            'personnel': '~10 military',
-            'mission': 'European Peace Facility'
-        },
-        'Benin': {
-            'color': '#66cc66',
-            'role': 'Bilateral partnership - Training National Guard, maritime security',
-            'personnel': 'Training missions',
-            'mission': 'Security cooperation (25+ years)'
-        },
-        'Mali': {
-            'color': '#ffcc66',
-            'role': 'Embassy security detachment (DAS) - Diplomatic protection',
-            'personnel': 'Security detachment',
-            'mission': 'Diplomatic protection'
-        },
-        'Burkina Faso': {
-            'color': '#ffcc66',
-            'role': 'Embassy security detachment (DAS) - Diplomatic protection',
-            'personnel': 'Security detachment',
-            'mission': 'Diplomatic protection'
-        },
-        'Niger': {
-            'color': '#ffcc66',
-            'role': 'Embassy security detachment (DAS) - Diplomatic protection',
-            'personnel': 'Security detachment',
-            'mission': 'Diplomatic protection'
-        },
-    }
+    # Load Natural Earth data, indexed by country name
+    countries = get_countries_by_name()
 
     # Add country polygons
-    for feature in geojson_data['features']:
-        country_name = feature['properties'].get('NAME')
-
-        if country_name in african_missions:
-            info = african_missions[country_name]
+    for country_name, info in AFRICAN_MISSIONS.items():
+        feature = countries.get(country_name)
 
-            popup_html = f"""
-            <div style="width: 280px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">{country_name}</h4>
-                <p style="margin: 4px 0;"><b>Mission:</b> {info['mission']}</p>
-                <p style="margin: 4px 0;"><b>Personnel:</b> {info['personnel']}</p>
-                <p style="margin: 4px 0; font-size: 11px;">{info['role']}</p>
-            </div>
-            """
+        if feature is not None:
+            # Attach the style to a copy; the cached features are shared
+            feature = dict(feature, properties=dict(feature['properties'],
+                                                    _style=_country_style(info['color'])))
 
             folium.GeoJson(
                 feature,
-                style_function=lambda x, color=info['color']: {
-                    'fillColor': color,
-                    'color': '#333333',
-                    'weight': 2,
-                    'fillOpacity': 0.6
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.8,
-                    'weight': 3
-                },
+                style_function=_feature_style,
+                highlight_function=_feature_highlight,
                 tooltip=country_name,
-                popup=folium.Popup(popup_html, max_width=320)
+                popup=folium.Popup(_country_popup_html(country_name, info), max_width=320)
             ).add_to(m)
 
     # Belgian embassies with security detachments
-    embassies = [
-        {
-            'name': 'Belgian Embassy Kinshasa',
-            'coords': [-4.3276, 15.3136],
-            'country': 'DRC',
-            'role': 'Embassy with security support',
-            'color': '#cc0000',
-            'icon': 'home'
-        },
-        {
-            'name': 'Belgian Embassy Bamako',
-            'coords': [12.6392, -8.0029],
-            'country': 'Mali',
-            'role': 'Embassy with DAS security detachment',
-            'color': '#cc0000',
-            'icon': 'home'
-        },
-        {
-            'name': 'Belgian Embassy Ouagadougou',
-            'coords': [12.3714, -1.5197],
-            'country': 'Burkina Faso',
-            'role': 'Embassy with DAS security detachment',
-            'color': '#cc0000',
-            'icon': 'home'
-        },
-        {
-            'name': 'Belgian Embassy Niamey',
-            'coords': [13.5116, 2.1254],
-            'country': 'Niger',
-            'role': 'Embassy with DAS security detachment',
-            'color': '#cc0000',
-            'icon': 'home'
-        },
-    ]
-
-    for embassy in embassies:
-        popup_html = f"""
-        <div style="width: 220px; font-family: Arial, sans-serif;">
-            <h4 style="margin: 0 0 8px 0;">{embassy['name']}</h4>
-            <p style="margin: 4px 0;"><b>Location:</b> {embassy['country']}</p>
-            <p style="margin: 4px 0;"><b>Role:</b> {embassy['role']}</p>
-        </div>
-        """
-
+    for embassy in EMBASSIES:
         folium.Marker(
             location=embassy['coords'],
-            popup=folium.Popup(popup_html, max_width=250),
+            popup=folium.Popup(_site_popup_html(embassy, 220), max_width=250),
             tooltip=embassy['name'],
             icon=folium.Icon(color='red', icon='home')
         ).add_to(m)
 
     # Operational sites in DRC
-    drc_sites = [
-        {
-            'name': 'Kindu',
-            'coords': [-2.9578, 25.9224],
-            'country': 'DRC (Maniema Province)',
-            'role': 'EPF project oversight center (through Dec 2027)',
-            'color': '#0066cc',
-            'icon': 'plane'
-        },
-        {
-            'name': 'Camp Lwama',
-            'coords': [-2.95, 25.95],  # Near Kindu
-            'country': 'DRC (near Kindu)',
-            'role': '31 Brigade equipment & infrastructure support',
-            'color': '#0066cc',
-            'icon': 'plane'
-        },
-    ]
-
-    for site in drc_sites:
-        popup_html = f"""
-        <div style="width: 240px; font-family: Arial, sans-serif;">
-            <h4 style="margin: 0 0 8px 0;">{site['name']}</h4>
-            <p style="margin: 4px 0;"><b>Location:</b> {site['country']}</p>
-            <p style="margin: 4px 0;"><b>Role:</b> {site['role']}</p>
-        </div>
-        """
-
+    for site in DRC_SITES:
         folium.Marker(
             location=site['coords'],
-            popup=folium.Popup(popup_html, max_width=260),
+            popup=folium.Popup(_site_popup_html(site, 240), max_width=260),
             tooltip=site['name'],
             icon=folium.Icon(color='blue', icon=site['icon'])
         ).add_to(m)
@@ -279,84 +472,15 @@ def create_african_missions_map(output_file='maps/african_missions_map.html'):
     ).add_to(m)
     '''
 
-    # Mission overview annotation box
-    overview_html = '''
-    <div style="position: fixed;
-                top: 80px; right: 15px; width: 320px;
-                background-color: white; border:2px solid #cc6600; z-index:9999;
-                font-size:11px; padding: 12px; line-height: 1.5;">
-    <p style="margin: 0 0 8px 0; font-weight: bold; color: #cc6600;">Belgian Missions in Africa</p>
-    <p style="margin: 4px 0; font-size: 10px;">
-        <b style="color: #ff6666;">DRC:</b> European Peace Facility (EPF)<br>
-        → Equipment & training for 31 Brigade<br>
-        → Camp Lwama (Kindu) operations<br>
-        → Through December 2027<br><br>
-
-        <b style="color: #66cc66;">Benin:</b> Bilateral Partnership<br>
-        → 25+ years of cooperation<br>
-        → National Guard training<br>
-        → Maritime security (Gulf of Guinea)<br><br>
-
-        <b style="color: #ffcc66;">Mali, Burkina Faso, Niger:</b><br>
-        → Embassy security detachments (DAS)<br>
-        → Diplomatic protection<br>
-        → Evacuation coordination<br><br>
-
-        <b>Sahel:</b> 3D Approach (Diplomacy, Development, Defense)
-    </p>
-    </div>
-    '''
-
-    # Legend
-    legend_html = '''
-    <div style="position: fixed;
-                bottom: 50px; right: 15px; width: 280px;
-                background-color: white; border:2px solid grey; z-index:9999;
-                font-size:11px; padding: 12px; line-height: 1.6;">
-    <p style="margin: 0 0 8px 0; font-weight: bold;">Mission Elements</p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #ff6666; padding: 2px 8px; border-radius: 3px;">■</span>
-        <b>DRC</b> - EPF equipment & training
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #66cc66; padding: 2px 8px; border-radius: 3px;">■</span>
-        <b>Benin</b> - Bilateral partnership
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #ffcc66; padding: 2px 8px; border-radius: 3px;">■</span>
-        <b>Sahel</b> - Embassy security (DAS)
-    </p>
-    <p style="margin: 4px 0;">
-        <i class="fa fa-home" style="color: red;"></i>
-        Belgian Embassies
-    </p>
-    <p style="margin: 4px 0;">
-        <i class="fa fa-plane" style="color: blue;"></i>
-        Operational sites (DRC)
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="border: 2px dashed #0066cc; padding: 2px 6px;">---</span>
-        Gulf of Guinea (piracy)
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="border: 2px dashed #cc6600; padding: 2px 6px;">---</span>
-        Sahel (terrorism)
-    </p>
-    <p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
-        Data source: Belgian Defence<br>
-        (mil.be/nl/onze-missies/missies-in-afrika)
-    </p>
-    </div>
-    '''
-
-    m.get_root().html.add_child(folium.Element(overview_html))
-    m.get_root().html.add_child(folium.Element(legend_html))
+    m.get_root().html.add_child(folium.Element(OVERVIEW_HTML))
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML))
 
     m.save(output_file)
     print(f" African missions map saved to {output_file}")
     return m
 
 
+
 if __name__ == "__main__":
     print("=" * 70)
     print("BELGIAN MILITARY MISSIONS IN AFRICA - Visualization")
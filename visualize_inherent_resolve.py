@@ -13,27 +13,176 @@ Mission Context (2024-2025):
 - ~2,000 coalition troops (down to ~1,000 in Syria by 2025)
 - ~3,000 ISIS fighters remain across Iraq and Syria (scattered, no continuous territory)
 
-INPUT: data/geojson/ne_110m_admin_0_countries.geojson, data/globe_locations.json
-OUTPUT: maps/inherent_resolve_map.html
+INPUT: data/geojson/oir_theater.geojson (built from data/geojson/ne_110m_admin_0_countries.geojson), data/globe_locations.json
+OUTPUT: maps/inherent_resolve_map.html (+ .html.gz)
+
+Pass --vector-tiles to draw the theater countries from maps/tiles/oir
+(see scripts/build_vector_tiles.py) instead of embedding their GeoJSON.
 """
-import json
 import folium
 import os
+from folium.plugins import MarkerCluster, VectorGridProtobuf
+import shutil
+import sys
+from map_common import (get_trimmed_country_geojson, load_geojson, map_cache_path, round_coords, store_cached_map,
+                        write_gzip_copy)
+from utils.map_making._jsonio import dump_json, load_json
+
+try:
+    import geopandas  # pyogrio's read_dataframe/write_dataframe need it
+    import pyogrio
+except ImportError:  # pyogrio or geopandas not installed, read the whole GeoJSON
+    pyogrio = None
+
+
+# Spatially indexed copy of the Natural Earth countries (needs pyogrio and geopandas)
+FGB_FILE = 'data/geojson/ne_110m_admin_0_countries.fgb'
+
+# (lon_min, lat_min, lon_max, lat_max) touching every OIR theater country
+OIR_BBOX = (35.0, 28.0, 50.0, 39.0)
+
+# Prebuilt OIR theater countries, written by build_theater_geojson
+THEATER_FILE = 'data/geojson/oir_theater.geojson'
+
+# Optional vector tiles of THEATER_FILE, written by scripts/build_vector_tiles.py
+OIR_TILES_DIR = 'maps/tiles/oir'
+OIR_TILES_LAYER = 'countries'
+OIR_TILES_MAXZOOM = 8
+
+# Leaflet.VectorGrid options; the style reads each feature's _color
+OIR_TILES_OPTIONS = '''{
+    "maxNativeZoom": %d,
+    "vectorTileLayerStyles": {
+        "%s": function(properties) {
+            return {fill: true, fillColor: properties._color, color: "#666666",
+                    weight: 1.5, fillOpacity: 0.5};
+        }
+    }
+}''' % (OIR_TILES_MAXZOOM, OIR_TILES_LAYER)
+
+# Countries in OIR theater
+OIR_COUNTRIES = {
+    'Iraq': {'color': '#ff9999', 'role': 'Primary theater - ISIS defeated 2017, training mission ongoing'},
+    'Syria': {'color': '#ffcccc', 'role': 'Active operations - Northeast governorates'},
+    'Kuwait': {'color': '#66ccff', 'role': 'Belgium location - Camp Arifjan logistics hub'},
+    'Turkey': {'color': '#e6e6e6', 'role': 'Coalition partner - Northern border'},
+    'Jordan': {'color': '#e6e6e6', 'role': 'Coalition partner - Al-Tanf support'},
+    'Saudi Arabia': {'color': '#e6e6e6', 'role': 'Coalition partner - Regional coordination'},
+    'Iran': {'color': '#ffeeee', 'role': 'Regional actor - Influence in Iraq/Syria'},
+}
 
 
 def load_globe_data(filepath='data/globe_locations.json'):
     """Load the extracted globe location data."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(filepath)
+
+
+def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson', bbox=None):
+    """
+    Load Natural Earth countries GeoJSON from cache.
+
+    The parse is memoized by map_common.load_geojson, shared with the other
+    map scripts, so repeated calls do not re-read it. Treat the result as
+    read-only.
+
+    Args:
+        cache_file: Path to the countries GeoJSON
+        bbox: Optional (lon_min, lat_min, lon_max, lat_max); when pyogrio and
+              geopandas are installed only the countries intersecting it
+              are read, from the FlatGeobuf copy (see _read_flatgeobuf)
+    """
+    if bbox is not None and pyogrio is not None:
+        return _read_flatgeobuf(cache_file, bbox)
+    return load_geojson(cache_file)
 
 
-def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson'):
-    """Load Natural Earth countries GeoJSON from cache."""
-    with open(cache_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def _read_flatgeobuf(cache_file, bbox, fgb_file=FGB_FILE):
+    """
+    Read the countries intersecting bbox from a FlatGeobuf copy of cache_file.
 
+    The copy is written on first use and rebuilt when cache_file is newer.
+    Its spatial index lets the reader skip every feature outside bbox.
+    Coordinates are rounded like map_common.get_trimmed_country_geojson.
+    """
+    if not os.path.exists(fgb_file) or os.path.getmtime(fgb_file) < os.path.getmtime(cache_file):
+        print(f"Writing FlatGeobuf copy of Natural Earth data: {fgb_file}")
+        # Keep each country's own geometry type; FlatGeobuf would otherwise make
+        # every Polygon a MultiPolygon
+        pyogrio.write_dataframe(pyogrio.read_dataframe(cache_file), fgb_file, driver='FlatGeobuf',
+                                promote_to_multi=False)
+
+    data = pyogrio.read_dataframe(fgb_file, bbox=bbox, columns=['NAME']).__geo_interface__
+    return dict(data, features=[
+        dict(feature, geometry=dict(feature['geometry'],
+                                    coordinates=round_coords(feature['geometry']['coordinates'], 4)))
+        for feature in data['features']
+    ])
+
+
+def build_theater_geojson(output_file=THEATER_FILE):
+    """
+    Write the OIR theater countries to output_file.
 
-def create_inherent_resolve_map(locations, output_file='maps/inherent_resolve_map.html'):
+    Keeps the OIR_COUNTRIES features of Natural Earth with trimmed
+    coordinates and NAME, _color and _role as properties, so the map does
+    not have to load all 177 countries. Rerun after changing
+    OIR_COUNTRIES (python -m scripts.build_theaters).
+    """
+    # With pyogrio (and geopandas) only the theater is read
+    if pyogrio is not None:
+        geojson_data = get_country_geojson(bbox=OIR_BBOX)
+    else:
+        geojson_data = get_trimmed_country_geojson()
+
+    features_by_name = {f['properties'].get('NAME'): f for f in geojson_data['features']}
+    features = []
+    for country_name, info in OIR_COUNTRIES.items():
+        feature = features_by_name.get(country_name)
+        if feature is None:
+            continue
+
+        features.append({
+            'type': 'Feature',
+            'properties': {'NAME': country_name, '_color': info['color'], '_role': info['role']},
+            'geometry': feature['geometry']
+        })
+
+    theater = {'type': 'FeatureCollection', 'features': features}
+    dump_json(theater, output_file, compact=True)
+    print(f"OIR theater GeoJSON saved to {output_file}")
+    return theater
+
+
+def get_theater_geojson(theater_file=THEATER_FILE):
+    """Load the prebuilt OIR theater GeoJSON (memoized, read-only), building it if missing."""
+    if os.path.exists(theater_file):
+        return load_geojson(theater_file)
+    return build_theater_geojson(theater_file)
+
+
+HIGHLIGHT_STYLE = {'fillOpacity': 0.7, 'weight': 2.5}
+
+# Base color -> folium.Icon marker color (anything else is red)
+MARKER_COLORS = {
+    '#00aa44': 'green',
+    '#0066cc': 'blue',
+    '#003399': 'darkblue',
+    '#cc0000': 'red',
+}
+
+
+def _theater_style(feature):
+    """folium style_function filling a theater country with its _color."""
+    return {'fillColor': feature['properties']['_color'], 'color': '#666666', 'weight': 1.5, 'fillOpacity': 0.5}
+
+
+def _theater_highlight(feature):
+    """folium highlight_function shared by all theater countries."""
+    return HIGHLIGHT_STYLE
+
+
+def create_inherent_resolve_map(locations, output_file='maps/inherent_resolve_map.html', use_cache=False,
+                                vector_tiles=False):
     """
     Create detailed map of Operation Inherent Resolve theater.
 
@@ -43,58 +192,64 @@ def create_inherent_resolve_map(locations, output_file='maps/inherent_resolve_ma
     - Key coalition bases
     - ISIS historical territory context
     - Mission timeline annotations
+
+    With use_cache set the saved HTML is also kept in map_common.MAP_CACHE_DIR.
+    When the inputs are unchanged since such a run, that copy is written to
+    output_file instead and None is returned rather than the folium.Map.
+
+    With vector_tiles set and the tiles of scripts/build_vector_tiles.py
+    present, the countries are drawn from OIR_TILES_DIR instead of being
+    embedded as GeoJSON; the browser then only decodes the visible tiles,
+    but the countries get no tooltip or popup.
     """
+    tiles_metadata = os.path.join(OIR_TILES_DIR, 'metadata.json')
+    tiles_url = None
+    if vector_tiles and os.path.exists(tiles_metadata):
+        # Tile URLs are relative to the saved HTML
+        tiles_url = os.path.relpath(OIR_TILES_DIR, os.path.dirname(os.path.abspath(output_file)))
+        tiles_url = tiles_url.replace(os.sep, '/') + '/{z}/{x}/{y}.pbf'
+
+    if use_cache:
+        # locations is not hashed: the map does not depend on it
+        cache_path = map_cache_path(__file__, output_file, {'tiles_url': tiles_url},
+                                    THEATER_FILE, *([tiles_metadata] if tiles_url else []))
+        if os.path.exists(cache_path):
+            shutil.copy(cache_path, output_file)
+            write_gzip_copy(output_file)
+            print(f" Inputs unchanged, map copied from cache to {output_file}")
+            return None
 
     # Center on Middle East (Iraq/Syria region)
     m = folium.Map(
         location=[33.5, 43.0],  # Central Iraq
         zoom_start=5,
-        tiles='CartoDB positron'
+        tiles='CartoDB positron',
+        prefer_canvas=True  # draw vector layers on one canvas, not SVG nodes
     )
 
-    # Load Natural Earth data
-    geojson_data = get_country_geojson()
-
-    # Countries in OIR theater
-    oir_countries = {
-        'Iraq': {'color': '#ff9999', 'role': 'Primary theater - ISIS defeated 2017, training mission ongoing'},
-        'Syria': {'color': '#ffcccc', 'role': 'Active operations - Northeast governorates'},
-        'Kuwait': {'color': '#66ccff', 'role': 'Belgium location - Camp Arifjan logistics hub'},
-        'Turkey': {'color': '#e6e6e6', 'role': 'Coalition partner - Northern border'},
-        'Jordan': {'color': '#e6e6e6', 'role': 'Coalition partner - Al-Tanf support'},
-        'Saudi Arabia': {'color': '#e6e6e6', 'role': 'Coalition partner - Regional coordination'},
-        'Iran': {'color': '#ffeeee', 'role': 'Regional actor - Influence in Iraq/Syria'},
-    }
-
-    # Add country polygons
-    for feature in geojson_data['features']:
-        country_name = feature['properties'].get('NAME')
-
-        if country_name in oir_countries:
-            info = oir_countries[country_name]
-
-            popup_html = f"""
-            <div style="width: 250px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">{country_name}</h4>
-                <p style="margin: 4px 0; font-size: 11px;">{info['role']}</p>
-            </div>
-            """
-
-            folium.GeoJson(
-                feature,
-                style_function=lambda x, color=info['color']: {
-                    'fillColor': color,
-                    'color': '#666666',
-                    'weight': 1.5,
-                    'fillOpacity': 0.5
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.7,
-                    'weight': 2.5
-                },
-                tooltip=country_name,
-                popup=folium.Popup(popup_html, max_width=300)
-            ).add_to(m)
+    if tiles_url is not None:
+        VectorGridProtobuf(
+            tiles_url,
+            name='OIR theater',
+            options=OIR_TILES_OPTIONS
+        ).add_to(m)
+    else:
+        # Prebuilt OIR countries (see build_theater_geojson); each feature
+        # carries its fill color and role, so tooltip and popup are both
+        # filled in client-side from the feature properties
+        folium.GeoJson(
+            get_theater_geojson(),
+            style_function=_theater_style,
+            highlight_function=_theater_highlight,
+            tooltip=folium.GeoJsonTooltip(fields=['NAME'], labels=False),
+            popup=folium.GeoJsonPopup(
+                fields=['NAME', '_role'],
+                aliases=['Country', 'Role'],
+                localize=False,
+                style='width: 250px; font-family: Arial, sans-serif; font-size: 11px;',
+                maxWidth=300
+            )
+        ).add_to(m)
 
     # Key coalition bases and locations
     bases = [
@@ -167,6 +322,9 @@ def create_inherent_resolve_map(locations, output_file='maps/inherent_resolve_ma
         },
     ]
 
+    # Cluster the base markers so overlapping ones collapse when zoomed out
+    base_cluster = MarkerCluster(name='Coalition bases').add_to(m)
+
     for base in bases:
         popup_html = f"""
         <div style="width: 220px; font-family: Arial, sans-serif;">
@@ -180,11 +338,8 @@ def create_inherent_resolve_map(locations, output_file='maps/inherent_resolve_ma
             location=base['coords'],
             popup=folium.Popup(popup_html, max_width=250),
             tooltip=base['name'],
-            icon=folium.Icon(color='green' if base['color'] == '#00aa44' else
-                            'blue' if base['color'] == '#0066cc' else
-                            'darkblue' if base['color'] == '#003399' else 'red',
-                            icon=base['icon'])
-        ).add_to(m)
+            icon=folium.Icon(color=MARKER_COLORS.get(base['color'], 'red'), icon=base['icon'])
+        ).add_to(base_cluster)
 
     # Historical ISIS territory indicator (2014-2017 peak)
     # Simplified polygon showing former ISIS "caliphate" extent
@@ -270,6 +425,9 @@ def create_inherent_resolve_map(locations, output_file='maps/inherent_resolve_ma
     m.get_root().html.add_child(folium.Element(legend_html))
 
     m.save(output_file)
+    if use_cache:
+        store_cached_map(output_file, cache_path)
+    write_gzip_copy(output_file)
     print(f" Operation Inherent Resolve map saved to {output_file}")
     return m
 
@@ -292,7 +450,8 @@ if __name__ == "__main__":
     print("\n" + "=" * 70)
 
     locations = load_globe_data()
-    create_inherent_resolve_map(locations)
+    # --vector-tiles: draw the countries from the scripts/build_vector_tiles.py tiles
+    create_inherent_resolve_map(locations, use_cache=True, vector_tiles='--vector-tiles' in sys.argv[1:])
 
     print("\nNext steps for temporal analysis:")
     print("  1. Historical phase (2014-2019): ISIS rise and territorial defeat")
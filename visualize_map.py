@@ -2,84 +2,117 @@
 """
 Create simple map visualizations of Belgian military mission locations.
 
-INPUT: data/globe_locations.json, data/geojson/ne_110m_admin_0_countries.geojson, data/geojson/baltic_sea_extracted.geojson
+INPUT: data/globe_locations.json, data/geojson/missions_theater.geojson (built from
+       data/geojson/ne_110m_admin_0_countries.geojson), data/geojson/baltic_sea_extracted.geojson
 """
-import json
+import os
+import shutil
+import urllib.request
 import folium
-import requests
-from collections import Counter
-
-
-# Country coordinates (approximate centers)
-COUNTRY_COORDS = {
-    "Romania": (45.9432, 24.9668),
-    "Baltic Sea": (58.0, 20.0),
-    "Lithuania": (55.1694, 23.8813),
-    "Latvia": (56.8796, 24.6032),
-    "Estonia": (58.5953, 25.0136),
-    "Dem. Rep. Congo": (-4.0383, 21.7587),
-    "Benin": (9.3077, 2.3158),
-    "Mali": (17.5707, -3.9962),
-    "Burkina Faso": (12.2383, -1.5616),
-    "Niger": (17.6078, 8.0817),
-    "Kuwait": (29.3117, 47.4818),
+from collections import Counter, defaultdict
+from map_common import (get_trimmed_country_geojson, load_geojson, map_cache_path, store_cached_map,
+                        write_gzip_copy)
+from utils.map_making._jsonio import dump_json, load_json
+
+
+# Prebuilt Natural Earth features for this map, written by build_theater_geojson
+THEATER_FILE = 'data/geojson/missions_theater.geojson'
+
+# Globe location -> Natural Earth NAME
+LOCATION_TO_NAME = {
+    "Romania": "Romania",
+    "Lithuania": "Lithuania",
+    "Latvia": "Latvia",
+    "Estonia": "Estonia",
+    "Dem. Rep. Congo": "Dem. Rep. Congo",  # Natural Earth uses same name
+    "Benin": "Benin",
+    "Mali": "Mali",
+    "Burkina Faso": "Burkina Faso",
+    "Niger": "Niger",
+    "Kuwait": "Kuwait",
 }
 
 
 def load_globe_data(filepath='data/globe_locations.json'):
     """Load the extracted globe location data."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(filepath)
 
 
 def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson'):
     """
     Fetch Natural Earth world countries GeoJSON data.
     Downloads once and caches locally to avoid repeated network requests.
+    The parse is memoized by map_common.load_geojson, shared with the other
+    map scripts; treat the result as read-only.
     """
-    import os
-
-    if os.path.exists(cache_file):
-        print(f"Loading Natural Earth data from cache: {cache_file}")
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    else:
+    if not os.path.exists(cache_file):
         url = "https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_110m_admin_0_countries.geojson"
         print(f"Downloading Natural Earth countries GeoJSON (first time)...")
-        response = requests.get(url)
-        data = response.json()
 
-        print(f"Saving to cache: {cache_file}")
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f)
+        # Stream the body straight into the cache, then parse it once below;
+        # the .part file keeps an interrupted download from being cached
+        with urllib.request.urlopen(url) as response, open(cache_file + '.part', 'wb') as f:
+            shutil.copyfileobj(response, f)
+        os.replace(cache_file + '.part', cache_file)
+        print(f"Saved to cache: {cache_file}")
+    else:
+        print(f"Loading Natural Earth data from cache: {cache_file}")
+
+    return load_geojson(cache_file)
 
-        return data
 
+def build_theater_geojson(output_file=THEATER_FILE):
+    """
+    Write the countries this map can highlight to output_file.
 
-def create_interactive_map(locations, output_file='maps/missions_map.html'):
-    """Create an interactive Folium map with full country polygons."""
-    import os
+    Keeps the LOCATION_TO_NAME countries and Belgium from Natural Earth,
+    with trimmed coordinates and NAME as their only property, so the map
+    does not have to load all 177 countries. Rerun after changing
+    LOCATION_TO_NAME (python -m scripts.build_theaters).
+    """
+    wanted = set(LOCATION_TO_NAME.values()) | {'Belgium'}
+    geojson_data = get_trimmed_country_geojson(load_countries=get_country_geojson)
 
-    m = folium.Map(location=[30, 15], zoom_start=3, tiles='CartoDB positron')
+    theater = {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {'NAME': f['properties']['NAME']}, 'geometry': f['geometry']}
+        for f in geojson_data['features'] if f['properties'].get('NAME') in wanted
+    ]}
+    dump_json(theater, output_file, compact=True)
+    print(f"Missions theater GeoJSON saved to {output_file}")
+    return theater
 
-    location_to_name = {
-        "Romania": "Romania",
-        "Lithuania": "Lithuania",
-        "Latvia": "Latvia",
-        "Estonia": "Estonia",
-        "Dem. Rep. Congo": "Dem. Rep. Congo",  # Natural Earth uses same name
-        "Benin": "Benin",
-        "Mali": "Mali",
-        "Burkina Faso": "Burkina Faso",
-        "Niger": "Niger",
-        "Kuwait": "Kuwait",
-    }
+
+def get_theater_geojson(theater_file=THEATER_FILE):
+    """Load the prebuilt theater GeoJSON (memoized, read-only), building it if missing."""
+    if os.path.exists(theater_file):
+        return load_geojson(theater_file)
+    return build_theater_geojson(theater_file)
+
+
+def create_interactive_map(locations, output_file='maps/missions_map.html', use_cache=False):
+    """
+    Create an interactive Folium map with full country polygons.
+
+    With use_cache set the saved HTML is also kept in map_common.MAP_CACHE_DIR.
+    When the inputs are unchanged since such a run, that copy is written to
+    output_file instead and None is returned rather than the folium.Map.
+    """
+    if use_cache:
+        cache_path = map_cache_path(__file__, output_file, locations, THEATER_FILE,
+                                    'data/geojson/baltic_sea_extracted.geojson')
+        if os.path.exists(cache_path):
+            shutil.copy(cache_path, output_file)
+            write_gzip_copy(output_file)
+            print(f"Inputs unchanged, map copied from cache to {output_file}")
+            return None
+
+    m = folium.Map(location=[30, 15], zoom_start=3, tiles='CartoDB positron')
 
     country_missions = {}
     for loc in locations:
         country = loc['Location']
-        if country in location_to_name and country != "Baltic Sea":
-            natural_earth_name = location_to_name[country]
+        if country in LOCATION_TO_NAME and country != "Baltic Sea":
+            natural_earth_name = LOCATION_TO_NAME[country]
             country_missions[natural_earth_name] = {
                 'name': country,
                 'mission': loc['Title'],
@@ -92,71 +125,80 @@ def create_interactive_map(locations, output_file='maps/missions_map.html'):
         'Missie Inherent Resolve': '#ff4444'
     }
 
-    geojson_data = get_country_geojson()
+    geojson_data = get_theater_geojson()
 
     # Load extracted Baltic Sea polygon
     baltic_sea_path = 'data/geojson/baltic_sea_extracted.geojson'
     if os.path.exists(baltic_sea_path):
-        with open(baltic_sea_path, 'r', encoding='utf-8') as f:
-            baltic_sea_data = json.load(f)
+        baltic_sea_data = load_json(baltic_sea_path)
     else:
         baltic_sea_data = None
 
-    for feature in geojson_data['features']:
-        country_name = feature['properties'].get('NAME')
-
-        if country_name in country_missions:
-            mission_info = country_missions[country_name]
-            mission = mission_info['mission']
-            color = mission_colors.get(mission, '#cccccc')
-
-            popup_html = f"""
-            <div style="width: 220px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">{mission_info['name']}</h4>
-                <p style="margin: 4px 0;"><b>Mission:</b><br>{mission}</p>
-                <a href="https://www.mil.be{mission_info['link']}" target="_blank">More info</a>
-            </div>
-            """
-
-            folium.GeoJson(
-                feature,
-                style_function=lambda x, color=color: {
-                    'fillColor': color,
-                    'color': '#333333',
-                    'weight': 1.5,
-                    'fillOpacity': 0.6
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.8,
-                    'weight': 3
-                },
-                tooltip=mission_info['name'],
-                popup=folium.Popup(popup_html, max_width=250)
-            ).add_to(m)
-        elif country_name == 'Belgium':
-            # Belgium - home country in green
-            popup_html = """
-            <div style="width: 200px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">Belgium</h4>
-                <p style="margin: 4px 0;">Home country</p>
-            </div>
-            """
-
-            folium.GeoJson(
-                feature,
-                style_function=lambda x: {
-                    'fillColor': '#28a745',
-                    'color': '#1e7e34',
-                    'weight': 2,
-                    'fillOpacity': 0.7
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.9,
-                    'weight': 3
-                },
-                tooltip='Belgium (Home)',
-                popup=folium.Popup(popup_html, max_width=250)
-            ).add_to(m)
+    # All highlighted areas go into one FeatureCollection layer; each
+    # feature carries its tooltip and popup, styles are looked up by NAME
+    features_by_name = {f['properties'].get('NAME'): f for f in geojson_data['features']}
+    features = []
+    styles = {}
+    highlights = {}
+    for country_name, mission_info in country_missions.items():
+        feature = features_by_name.get(country_name)
+        if feature is None:
+            continue
+
+        mission = mission_info['mission']
+        color = mission_colors.get(mission, '#cccccc')
+
+        popup_html = f"""
+        <div style="width: 220px; font-family: Arial, sans-serif;">
+            <h4 style="margin: 0 0 8px 0;">{mission_info['name']}</h4>
+            <p style="margin: 4px 0;"><b>Mission:</b><br>{mission}</p>
+            <a href="https://www.mil.be{mission_info['link']}" target="_blank">More info</a>
+        </div>
+        """
+
+        features.append({
+            'type': 'Feature',
+            'properties': {
+                'NAME': country_name,
+                '_tooltip': mission_info['name'],
+                '_popup': popup_html
+            },
+            'geometry': feature['geometry']
+        })
+        styles[country_name] = {
+            'fillColor': color,
+            'color': '#333333',
+            'weight': 1.5,
+            'fillOpacity': 0.6
+        }
+        highlights[country_name] = {'fillOpacity': 0.8, 'weight': 3}
+
+    # Belgium - home country in green
+    belgium = features_by_name.get('Belgium')
+    if belgium is not None:
+        popup_html = """
+        <div style="width: 200px; font-family: Arial, sans-serif;">
+            <h4 style="margin: 0 0 8px 0;">Belgium</h4>
+            <p style="margin: 4px 0;">Home country</p>
+        </div>
+        """
+
+        features.append({
+            'type': 'Feature',
+            'properties': {
+                'NAME': 'Belgium',
+                '_tooltip': 'Belgium (Home)',
+                '_popup': popup_html
+            },
+            'geometry': belgium['geometry']
+        })
+        styles['Belgium'] = {
+            'fillColor': '#28a745',
+            'color': '#1e7e34',
+            'weight': 2,
+            'fillOpacity': 0.7
+        }
+        highlights['Belgium'] = {'fillOpacity': 0.9, 'weight': 3}
 
     # Add Baltic Sea as part of Eastern Flank
     for loc in locations:
@@ -169,21 +211,30 @@ def create_interactive_map(locations, output_file='maps/missions_map.html'):
             </div>
             """
 
-            folium.GeoJson(
-                baltic_sea_data,
-                style_function=lambda x: {
-                    'fillColor': '#3388ff',  # Same as Eastern Flank
-                    'color': '#1a66cc',
-                    'weight': 2,
-                    'fillOpacity': 0.6
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.8,
-                    'weight': 3
+            features.append({
+                'type': 'Feature',
+                'properties': {
+                    'NAME': 'Baltic Sea',
+                    '_tooltip': 'Baltic Sea (Eastern Flank)',
+                    '_popup': popup_html
                 },
-                tooltip="Baltic Sea (Eastern Flank)",
-                popup=folium.Popup(popup_html, max_width=250)
-            ).add_to(m)
+                'geometry': baltic_sea_data['geometry']
+            })
+            styles['Baltic Sea'] = {
+                'fillColor': '#3388ff',  # Same as Eastern Flank
+                'color': '#1a66cc',
+                'weight': 2,
+                'fillOpacity': 0.6
+            }
+            highlights['Baltic Sea'] = {'fillOpacity': 0.8, 'weight': 3}
+
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        style_function=lambda x: styles[x['properties']['NAME']],
+        highlight_function=lambda x: highlights[x['properties']['NAME']],
+        tooltip=folium.GeoJsonTooltip(fields=['_tooltip'], labels=False),
+        popup=folium.GeoJsonPopup(fields=['_popup'], labels=False, localize=False, maxWidth=250)
+    ).add_to(m)
 
     legend_html = '''
     <div style="position: fixed;
@@ -216,6 +267,9 @@ def create_interactive_map(locations, output_file='maps/missions_map.html'):
     m.get_root().html.add_child(folium.Element(legend_html))
 
     m.save(output_file)
+    if use_cache:
+        store_cached_map(output_file, cache_path)
+    write_gzip_copy(output_file)
     print(f"Interactive map saved to {output_file}")
     return m
 
@@ -225,24 +279,21 @@ def create_text_summary(locations):
 
     print("\n=== BELGIAN MILITARY MISSIONS - GEOGRAPHICAL SUMMARY ===\n")
 
-    # Group by mission category
-    by_category = {}
+    # Group by mission category, and count locations in one pass
+    by_category = defaultdict(list)
+    location_counts = Counter()
     for loc in locations:
-        title = loc['Title']
-        country = loc['Location']
-
-        if title not in by_category:
-            by_category[title] = []
-        by_category[title].append(country)
+        by_category[loc['Title']].append(loc['Location'])
+        location_counts[loc['Location']] += 1
 
     # Print summary
     for mission_title, countries in by_category.items():
         print(f"\n{mission_title}:")
-        print(f"  Countries: {', '.join(set(countries))}")
+        print(f"  Countries: {', '.join(dict.fromkeys(countries))}")
         print(f"  Total locations: {len(countries)}")
 
     print(f"\n\nTOTAL MISSION LOCATIONS: {len(locations)}")
-    print(f"UNIQUE COUNTRIES: {len(set(loc['Location'] for loc in locations))}")
+    print(f"UNIQUE COUNTRIES: {len(location_counts)}")
 
     # Regional breakdown
     print("\n=== REGIONAL BREAKDOWN ===")
@@ -253,7 +304,7 @@ def create_text_summary(locations):
     }
 
     for region, region_countries in regions.items():
-        count = sum(1 for loc in locations if loc['Location'] in region_countries)
+        count = sum(location_counts[c] for c in region_countries)
         print(f"{region}: {count} locations")
 
 
@@ -267,5 +318,5 @@ if __name__ == "__main__":
     # Create interactive map
     print("\n" + "="*60)
     print("Creating interactive map...")
-    create_interactive_map(locations)
+    create_interactive_map(locations, use_cache=True)
     print("\nOpen data/missions_map.html in a web browser to view the map")
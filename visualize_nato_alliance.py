@@ -18,33 +18,119 @@ Historical Context:
 
 INPUT: data/geojson/ne_110m_admin_0_countries.geojson
 OUTPUT:  maps/nato_alliance_map.html
+
+Pass --vector-tiles to draw the member countries from vector tiles in
+maps/tiles/nato (built by scripts/build_vector_tiles.py) instead of
+embedding their GeoJSON.
 """
-import json
+import os
+import sys
 import folium
-
-
-def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson'):
-    """Load Natural Earth countries GeoJSON from cache."""
-    with open(cache_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def create_nato_alliance_map(output_file='maps/nato_alliance_map.html'):
+from folium.plugins import VectorGridProtobuf
+from map_common import (MEMBER_POPUP_STYLE, get_country_geojson, member_highlight, round_coords,
+                        save_map, write_gzip_copy)
+
+# Optional vector tiles of the member layer, written by scripts/build_vector_tiles.py
+NATO_TILES_DIR = 'maps/tiles/nato'
+NATO_TILES_LAYER = 'nato'
+NATO_TILES_MAXZOOM = 6
+
+# Leaflet.VectorGrid options, styled like _member_style
+NATO_TILES_OPTIONS = '''{
+    "maxNativeZoom": %d,
+    "vectorTileLayerStyles": {
+        "%s": function(properties) {
+            return {fill: true, fillColor: properties._color, color: "#000000",
+                    weight: 1.5, fillOpacity: 0.7};
+        }
+    }
+}''' % (NATO_TILES_MAXZOOM, NATO_TILES_LAYER)
+
+
+# Historical timeline box
+TIMELINE_HTML = '''
+<div style="position: fixed;
+            top: 80px; right: 15px; width: 320px;
+            background-color: white; border:2px solid #003399; z-index:9999;
+            font-size:11px; padding: 12px; line-height: 1.5;">
+<p style="margin: 0 0 8px 0; font-weight: bold; color: #003399;">NATO Expansion Timeline</p>
+<p style="margin: 4px 0; font-size: 10px;">
+    <b style="color: #003399;">Before 1989 (Cold War Era):</b><br>
+    • 1949: 12 founding members<br>
+    • 1952: Greece, Turkey<br>
+    • 1955: West Germany<br>
+    • 1982: Spain<br>
+    <b>Total: 16 members by 1989</b><br><br>
+
+    <b style="color: #6699cc;">After 1989 (Post-Cold War):</b><br>
+    • 1999: Czech Rep., Hungary, Poland<br>
+    • 2004: 7 Eastern European states<br>
+    • 2009: Albania, Croatia<br>
+    • 2017: Montenegro<br>
+    • 2020: North Macedonia<br>
+    • 2023: Finland<br>
+    • 2024: Sweden<br>
+    <b>Total: 32 members as of 2024</b>
+</p>
+<p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
+    Article 5: Collective defense - attack on<br>
+    one is attack on all (invoked once: 9/11)
+</p>
+</div>
+'''
+
+# Legend
+LEGEND_HTML = '''
+<div style="position: fixed;
+            bottom: 50px; right: 15px; width: 280px;
+            background-color: white; border:2px solid grey; z-index:9999;
+            font-size:11px; padding: 12px; line-height: 1.6;">
+<p style="margin: 0 0 8px 0; font-weight: bold;">NATO Alliance</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #003399; padding: 2px 12px; border-radius: 3px;">■</span>
+    <b>Before 1989</b> - Original & Cold War members (16)
+</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #6699cc; padding: 2px 12px; border-radius: 3px;">■</span>
+    <b>After 1989</b> - Post-Cold War expansion (16)
+</p>
+<p style="margin: 4px 0;">
+    <i class="fa fa-star" style="color: darkblue;"></i>
+    NATO Headquarters (Brussels)
+</p>
+<p style="margin: 8px 0 4px 0; font-size: 10px; color: #333;">
+    <b>Belgium's Role:</b><br>
+    • Founding member (1949)<br>
+    • Hosts NATO HQ since 1967<br>
+    • Active contributor to missions
+</p>
+<p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
+    Data source: NATO official records<br>
+    32 member states as of 2024
+</p>
+</div>
+'''
+
+# Popup label per membership era
+ERA_TEXT = {
+    'original': 'Founding Member (1949)',
+    'cold_war': 'Cold War Era Member',
+    'post_cold_war': 'Post-Cold War Expansion'
+}
+
+
+def _member_style(feature):
+    """folium style_function filling a member country with its _color."""
+    return {'fillColor': feature['properties']['_color'], 'color': '#000000', 'weight': 1.5, 'fillOpacity': 0.7}
+
+
+def build_member_features():
     """
-    Create map of NATO alliance with historical membership context.
+    FeatureCollection of the NATO member countries as drawn on the map.
 
-    Colors:
-    - Dark blue: Original/Cold War members (before 1989)
-    - Light blue: Post-Cold War expansion (1989 and after)
+    Also the source of the vector tiles in NATO_TILES_DIR, see
+    scripts/build_vector_tiles.py.
     """
-
-    # Center on North Atlantic region
-    m = folium.Map(
-        location=[50.0, 15.0],  # Central Europe
-        zoom_start=3,
-        tiles='CartoDB positron'
-    )
-
     # Load Natural Earth data
     geojson_data = get_country_geojson()
 
@@ -94,50 +180,76 @@ def create_nato_alliance_map(output_file='maps/nato_alliance_map.html'):
         'Sweden': {'year': 2024, 'era': 'post_cold_war', 'color': '#6699cc'},
     }
 
-    # Add country polygons
-    for feature in geojson_data['features']:
-        country_name = feature['properties'].get('NAME')
-
-        if country_name in nato_members:
-            info = nato_members[country_name]
-
-            era_text = {
-                'original': 'Founding Member (1949)',
-                'cold_war': 'Cold War Era Member',
-                'post_cold_war': 'Post-Cold War Expansion'
-            }[info['era']]
-            if country_name == 'Germany':
-                popup_html = f"""
-            <div style="width: 260px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">(West) {country_name}</h4>
-                <p style="margin: 4px 0;"><b>Joined NATO:</b> {info['year']}</p>
-                <p style="margin: 4px 0;"><b>Era:</b> {era_text}</p>
-            </div>
-            """
-            else:
-                popup_html = f"""
-            <div style="width: 260px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">{country_name}</h4>
-                <p style="margin: 4px 0;"><b>Joined NATO:</b> {info['year']}</p>
-                <p style="margin: 4px 0;"><b>Era:</b> {era_text}</p>
-            </div>
-            """
-
-            folium.GeoJson(
-                feature,
-                style_function=lambda x, color=info['color']: {
-                    'fillColor': color,
-                    'color': '#000000',
-                    'weight': 1.5,
-                    'fillOpacity': 0.7
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.9,
-                    'weight': 2.5
-                },
-                tooltip=f"{country_name} ({info['year']})",
-                popup=folium.Popup(popup_html, max_width=300)
-            ).add_to(m)
+    # All member countries go into one FeatureCollection layer; each
+    # feature carries only its NAME, fill color and the fields of its
+    # tooltip and popup (not the ~80 Natural Earth properties)
+    features_by_name = {f['properties'].get('NAME'): f for f in geojson_data['features']}
+    features = []
+    for country_name, info in nato_members.items():
+        feature = features_by_name.get(country_name)
+        if feature is None:
+            continue
+
+        features.append({
+            'type': 'Feature',
+            'properties': {
+                'NAME': country_name,
+                '_color': info['color'],
+                # Germany joined as West Germany
+                '_display_name': '(West) Germany' if country_name == 'Germany' else country_name,
+                '_year': info['year'],
+                '_era_text': ERA_TEXT[info['era']]
+            },
+            # 3 decimals (~110 m) is finer than a pixel at these zoom levels
+            'geometry': dict(feature['geometry'], coordinates=round_coords(feature['geometry']['coordinates'], 3))
+        })
+
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def create_nato_alliance_map(output_file='maps/nato_alliance_map.html', vector_tiles=False):
+    """
+    Create map of NATO alliance with historical membership context.
+
+    Colors:
+    - Dark blue: Original/Cold War members (before 1989)
+    - Light blue: Post-Cold War expansion (1989 and after)
+
+    With vector_tiles set and the tiles of scripts/build_vector_tiles.py
+    present, the member countries are drawn from NATO_TILES_DIR instead of
+    being embedded as GeoJSON; they then get no tooltip or popup.
+    """
+
+    # Center on North Atlantic region
+    m = folium.Map(
+        location=[50.0, 15.0],  # Central Europe
+        zoom_start=3,
+        tiles='CartoDB positron',
+        prefer_canvas=True  # draw the country polygons on one canvas, not SVG nodes
+    )
+
+    if vector_tiles and os.path.exists(os.path.join(NATO_TILES_DIR, 'metadata.json')):
+        # Tile URLs are relative to the saved HTML
+        tiles_url = os.path.relpath(NATO_TILES_DIR, os.path.dirname(os.path.abspath(output_file)))
+        VectorGridProtobuf(
+            tiles_url.replace(os.sep, '/') + '/{z}/{x}/{y}.pbf',
+            name='NATO members',
+            options=NATO_TILES_OPTIONS
+        ).add_to(m)
+    else:
+        folium.GeoJson(
+            build_member_features(),
+            style_function=_member_style,
+            highlight_function=member_highlight,
+            tooltip=folium.GeoJsonTooltip(fields=['NAME', '_year'], aliases=['Country:', 'Joined:']),
+            popup=folium.GeoJsonPopup(
+                fields=['_display_name', '_year', '_era_text'],
+                aliases=['Country', 'Joined NATO', 'Era'],
+                localize=False,  # would print the years as 1,949
+                style=MEMBER_POPUP_STYLE,
+                maxWidth=300
+            )
+        ).add_to(m)
 
     # NATO Headquarters marker
     folium.Marker(
@@ -153,74 +265,11 @@ def create_nato_alliance_map(output_file='maps/nato_alliance_map.html'):
         icon=folium.Icon(color='darkblue', icon='star')
     ).add_to(m)
 
-    # Historical timeline box
-    timeline_html = '''
-    <div style="position: fixed;
-                top: 80px; right: 15px; width: 320px;
-                background-color: white; border:2px solid #003399; z-index:9999;
-                font-size:11px; padding: 12px; line-height: 1.5;">
-    <p style="margin: 0 0 8px 0; font-weight: bold; color: #003399;">NATO Expansion Timeline</p>
-    <p style="margin: 4px 0; font-size: 10px;">
-        <b style="color: #003399;">Before 1989 (Cold War Era):</b><br>
-        • 1949: 12 founding members<br>
-        • 1952: Greece, Turkey<br>
-        • 1955: West Germany<br>
-        • 1982: Spain<br>
-        <b>Total: 16 members by 1989</b><br><br>
-
-        <b style="color: #6699cc;">After 1989 (Post-Cold War):</b><br>
-        • 1999: Czech Rep., Hungary, Poland<br>
-        • 2004: 7 Eastern European states<br>
-        • 2009: Albania, Croatia<br>
-        • 2017: Montenegro<br>
-        • 2020: North Macedonia<br>
-        • 2023: Finland<br>
-        • 2024: Sweden<br>
-        <b>Total: 32 members as of 2024</b>
-    </p>
-    <p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
-        Article 5: Collective defense - attack on<br>
-        one is attack on all (invoked once: 9/11)
-    </p>
-    </div>
-    '''
-
-    # Legend
-    legend_html = '''
-    <div style="position: fixed;
-                bottom: 50px; right: 15px; width: 280px;
-                background-color: white; border:2px solid grey; z-index:9999;
-                font-size:11px; padding: 12px; line-height: 1.6;">
-    <p style="margin: 0 0 8px 0; font-weight: bold;">NATO Alliance</p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #003399; padding: 2px 12px; border-radius: 3px;">■</span>
-        <b>Before 1989</b> - Original & Cold War members (16)
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #6699cc; padding: 2px 12px; border-radius: 3px;">■</span>
-        <b>After 1989</b> - Post-Cold War expansion (16)
-    </p>
-    <p style="margin: 4px 0;">
-        <i class="fa fa-star" style="color: darkblue;"></i>
-        NATO Headquarters (Brussels)
-    </p>
-    <p style="margin: 8px 0 4px 0; font-size: 10px; color: #333;">
-        <b>Belgium's Role:</b><br>
-        • Founding member (1949)<br>
-        • Hosts NATO HQ since 1967<br>
-        • Active contributor to missions
-    </p>
-    <p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
-        Data source: NATO official records<br>
-        32 member states as of 2024
-    </p>
-    </div>
-    '''
-
-    m.get_root().html.add_child(folium.Element(timeline_html))
-    m.get_root().html.add_child(folium.Element(legend_html))
-
-    m.save(output_file)
+    m.get_root().html.add_child(folium.Element(TIMELINE_HTML))
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML))
+
+    save_map(m, output_file)
+    write_gzip_copy(output_file)
     print(f" NATO alliance map saved to {output_file}")
     return m
 
@@ -263,7 +312,8 @@ if __name__ == "__main__":
 
     print("\n" + "=" * 70)
 
-    create_nato_alliance_map()
+    # --vector-tiles: draw the member countries from maps/tiles/nato when built
+    create_nato_alliance_map(vector_tiles='--vector-tiles' in sys.argv[1:])
 
     print("\nMap Features:")
     print("  - Dark blue: Pre-1989 members (Cold War era)")
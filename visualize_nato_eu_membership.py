@@ -18,14 +18,137 @@ Current status:
 INPUT: data/geojson/ne_110m_admin_0_countries.geojson
 OUTPUT: maps/nato_eu_membership_map.html
 """
-import json
 import folium
-
-
-def get_country_geojson(cache_file='data/geojson/ne_110m_admin_0_countries.geojson'):
-    """Load Natural Earth countries GeoJSON from cache."""
-    with open(cache_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from map_common import (MEMBER_POPUP_STYLE, get_country_geojson, member_highlight, round_coords,
+                        save_map, write_gzip_copy)
+
+
+# Current NATO members (32)
+NATO_MEMBERS = frozenset({
+    # Original members
+    'Belgium', 'Canada', 'Denmark', 'France', 'Iceland', 'Italy',
+    'Luxembourg', 'Netherlands', 'Norway', 'Portugal', 'United Kingdom',
+    'United States of America',
+    # Cold War expansion
+    'Greece', 'Turkey', 'Germany', 'Spain',
+    # Post-Cold War expansion
+    'Czechia', 'Hungary', 'Poland',
+    'Bulgaria', 'Estonia', 'Latvia', 'Lithuania', 'Romania',
+    'Slovakia', 'Slovenia',
+    'Albania', 'Croatia',
+    'Montenegro', 'North Macedonia',
+    'Finland', 'Sweden'
+})
+
+# Current EU members (27) - as of 2024
+EU_MEMBERS = frozenset({
+    # Founding 6 (1957)
+    'Belgium', 'France', 'Germany', 'Italy', 'Luxembourg', 'Netherlands',
+    # 1973 expansion
+    'Denmark', 'Ireland',
+    # 1980s expansion
+    'Greece', 'Spain', 'Portugal',
+    # 1995 expansion
+    'Austria', 'Finland', 'Sweden',
+    # 2004 expansion
+    'Cyprus', 'Czechia', 'Estonia', 'Hungary', 'Latvia', 'Lithuania',
+    'Poland', 'Slovakia', 'Slovenia',
+    # Note: Malta is EU member but not visible in 110m Natural Earth dataset (too small)
+    # 2007 expansion
+    'Bulgaria', 'Romania',
+    # 2013 expansion
+    'Croatia'
+    # Note: UK left EU in 2020 (Brexit)
+})
+
+# Categorize countries
+BOTH_NATO_EU = NATO_MEMBERS & EU_MEMBERS
+NATO_ONLY = NATO_MEMBERS - EU_MEMBERS
+EU_ONLY = EU_MEMBERS - NATO_MEMBERS
+
+# Define colors and information; each category's record is shared by all
+# of its countries, so treat them as read-only
+COUNTRY_INFO = {
+    **dict.fromkeys(BOTH_NATO_EU, {
+        'category': 'Both NATO & EU',
+        'color': '#9933cc',  # Purple
+        'details': 'Member of both NATO and European Union'
+    }),
+    **dict.fromkeys(NATO_ONLY, {
+        'category': 'NATO Only',
+        'color': '#0066cc',  # Blue
+        'details': 'NATO member, not in European Union'
+    }),
+    **dict.fromkeys(EU_ONLY, {
+        'category': 'EU Only',
+        'color': '#ffcc00',  # Yellow
+        'details': 'European Union member, not in NATO'
+    }),
+}
+
+# Overview box; the counts are filled in with str.format
+OVERVIEW_HTML = '''
+<div style="position: fixed;
+            top: 80px; right: 15px; width: 300px;
+            background-color: white; border:2px solid #9933cc; z-index:9999;
+            font-size:11px; padding: 12px; line-height: 1.5;">
+<p style="margin: 0 0 8px 0; font-weight: bold; color: #9933cc;">NATO & EU Membership (2024)</p>
+<p style="margin: 4px 0; font-size: 10px;">
+    <b style="color: #9933cc;">Both NATO & EU:</b> {both} countries<br>
+    → Most European NATO members<br>
+    → Includes Belgium (hosts both HQs)<br><br>
+
+    <b style="color: #0066cc;">NATO Only:</b> {nato_only} countries<br>
+    → Includes USA, Canada, UK<br>
+    → Turkey, Albania, North Macedonia<br>
+    → Iceland, Norway, Montenegro<br><br>
+
+    <b style="color: #ffcc00;">EU Only:</b> {eu_only} countries<br>
+    → Ireland, Austria (neutral states)<br>
+    → Cyprus (island nation)<br>
+    → Note: Malta not visible at this scale<br>
+</p>
+<p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
+    Total NATO: {nato_total} members<br>
+    Total EU: {eu_total} visible (27 total incl. Malta)
+</p>
+</div>
+'''
+
+# Legend with counts, filled in like OVERVIEW_HTML
+LEGEND_HTML = '''
+<div style="position: fixed;
+            bottom: 50px; right: 15px; width: 280px;
+            background-color: white; border:2px solid grey; z-index:9999;
+            font-size:11px; padding: 12px; line-height: 1.6;">
+<p style="margin: 0 0 8px 0; font-weight: bold;">Membership Categories</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #9933cc; padding: 2px 12px; border-radius: 3px; color: white;">■</span>
+    <b>Both NATO & EU</b> ({both} countries)
+</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #0066cc; padding: 2px 12px; border-radius: 3px; color: white;">■</span>
+    <b>NATO Only</b> ({nato_only} countries)
+</p>
+<p style="margin: 4px 0;">
+    <span style="background-color: #ffcc00; padding: 2px 12px; border-radius: 3px;">■</span>
+    <b>EU Only</b> ({eu_only} countries)
+</p>
+<p style="margin: 8px 0 4px 0; border-top: 1px solid #ccc; padding-top: 8px;">
+    <i class="fa fa-star" style="color: darkblue;"></i> NATO HQ (Brussels)<br>
+    <i class="fa fa-star" style="color: orange;"></i> EU HQ (Brussels)
+</p>
+<p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
+    Belgium: Member of both alliances<br>
+    and hosts both headquarters
+</p>
+</div>
+'''
+
+
+def _member_style(feature):
+    """folium style_function filling a member country with its _color."""
+    return {'fillColor': feature['properties']['_color'], 'color': '#333333', 'weight': 1.5, 'fillOpacity': 0.7}
 
 
 def create_nato_eu_map(output_file='maps/nato_eu_membership_map.html'):
@@ -42,109 +165,50 @@ def create_nato_eu_map(output_file='maps/nato_eu_membership_map.html'):
     m = folium.Map(
         location=[50.0, 15.0],  # Central Europe
         zoom_start=3,
-        tiles='CartoDB positron'
+        tiles='CartoDB positron',
+        prefer_canvas=True  # draw the country polygons on one canvas, not SVG nodes
     )
 
     # Load Natural Earth data
     geojson_data = get_country_geojson()
 
-    # Current NATO members (32)
-    nato_members = {
-        # Original members
-        'Belgium', 'Canada', 'Denmark', 'France', 'Iceland', 'Italy',
-        'Luxembourg', 'Netherlands', 'Norway', 'Portugal', 'United Kingdom',
-        'United States of America',
-        # Cold War expansion
-        'Greece', 'Turkey', 'Germany', 'Spain',
-        # Post-Cold War expansion
-        'Czechia', 'Hungary', 'Poland',
-        'Bulgaria', 'Estonia', 'Latvia', 'Lithuania', 'Romania',
-        'Slovakia', 'Slovenia',
-        'Albania', 'Croatia',
-        'Montenegro', 'North Macedonia',
-        'Finland', 'Sweden'
-    }
-
-    # Current EU members (27) - as of 2024
-    eu_members = {
-        # Founding 6 (1957)
-        'Belgium', 'France', 'Germany', 'Italy', 'Luxembourg', 'Netherlands',
-        # 1973 expansion
-        'Denmark', 'Ireland',
-        # 1980s expansion
-        'Greece', 'Spain', 'Portugal',
-        # 1995 expansion
-        'Austria', 'Finland', 'Sweden',
-        # 2004 expansion
-        'Cyprus', 'Czechia', 'Estonia', 'Hungary', 'Latvia', 'Lithuania',
-        'Poland', 'Slovakia', 'Slovenia',
-        # Note: Malta is EU member but not visible in 110m Natural Earth dataset (too small)
-        # 2007 expansion
-        'Bulgaria', 'Romania',
-        # 2013 expansion
-        'Croatia'
-        # Note: UK left EU in 2020 (Brexit)
-    }
-
-    # Categorize countries
-    both_nato_eu = nato_members.intersection(eu_members)
-    nato_only = nato_members - eu_members
-    eu_only = eu_members - nato_members
-
-    # Define colors and information
-    country_info = {}
-
-    for country in both_nato_eu:
-        country_info[country] = {
-            'category': 'Both NATO & EU',
-            'color': '#9933cc',  # Purple
-            'details': 'Member of both NATO and European Union'
-        }
-
-    for country in nato_only:
-        country_info[country] = {
-            'category': 'NATO Only',
-            'color': '#0066cc',  # Blue
-            'details': 'NATO member, not in European Union'
-        }
-
-    for country in eu_only:
-        country_info[country] = {
-            'category': 'EU Only',
-            'color': '#ffcc00',  # Yellow
-            'details': 'European Union member, not in NATO'
-        }
-
-    # Add country polygons
-    for feature in geojson_data['features']:
-        country_name = feature['properties'].get('NAME')
-
-        if country_name in country_info:
-            info = country_info[country_name]
-
-            popup_html = f"""
-            <div style="width: 260px; font-family: Arial, sans-serif;">
-                <h4 style="margin: 0 0 8px 0;">{country_name}</h4>
-                <p style="margin: 4px 0;"><b>Status:</b> {info['category']}</p>
-                <p style="margin: 4px 0; font-size: 11px;">{info['details']}</p>
-            </div>
-            """
-
-            folium.GeoJson(
-                feature,
-                style_function=lambda x, color=info['color']: {
-                    'fillColor': color,
-                    'color': '#333333',
-                    'weight': 1.5,
-                    'fillOpacity': 0.7
-                },
-                highlight_function=lambda x: {
-                    'fillOpacity': 0.9,
-                    'weight': 2.5
-                },
-                tooltip=f"{country_name} - {info['category']}",
-                popup=folium.Popup(popup_html, max_width=300)
-            ).add_to(m)
+    # All member countries go into one FeatureCollection layer; each
+    # feature carries only its NAME, fill color and the fields of its
+    # tooltip and popup (not the ~80 Natural Earth properties)
+    features_by_name = {f['properties'].get('NAME'): f for f in geojson_data['features']}
+    features = []
+    # Sorted, since the set-built COUNTRY_INFO has no stable order
+    for country_name in sorted(COUNTRY_INFO):
+        info = COUNTRY_INFO[country_name]
+        feature = features_by_name.get(country_name)
+        if feature is None:
+            continue
+
+        features.append({
+            'type': 'Feature',
+            'properties': {
+                'NAME': country_name,
+                '_color': info['color'],
+                '_category': info['category'],
+                '_details': info['details']
+            },
+            # 3 decimals (~110 m) is finer than a pixel at these zoom levels
+            'geometry': dict(feature['geometry'], coordinates=round_coords(feature['geometry']['coordinates'], 3))
+        })
+
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        style_function=_member_style,
+        highlight_function=member_highlight,
+        tooltip=folium.GeoJsonTooltip(fields=['NAME', '_category'], aliases=['Country:', 'Status:']),
+        popup=folium.GeoJsonPopup(
+            fields=['NAME', '_category', '_details'],
+            aliases=['Country', 'Status', 'Details'],
+            localize=False,
+            style=MEMBER_POPUP_STYLE,
+            maxWidth=300
+        )
+    ).add_to(m)
 
     # NATO HQ marker
     folium.Marker(
@@ -173,71 +237,15 @@ def create_nato_eu_map(output_file='maps/nato_eu_membership_map.html'):
         icon=folium.Icon(color='orange', icon='star', prefix='fa')
     ).add_to(m)
 
-    # Overview box
-    overview_html = f'''
-    <div style="position: fixed;
-                top: 80px; right: 15px; width: 300px;
-                background-color: white; border:2px solid #9933cc; z-index:9999;
-                font-size:11px; padding: 12px; line-height: 1.5;">
-    <p style="margin: 0 0 8px 0; font-weight: bold; color: #9933cc;">NATO & EU Membership (2024)</p>
-    <p style="margin: 4px 0; font-size: 10px;">
-        <b style="color: #9933cc;">Both NATO & EU:</b> {len(both_nato_eu)} countries<br>
-        → Most European NATO members<br>
-        → Includes Belgium (hosts both HQs)<br><br>
-
-        <b style="color: #0066cc;">NATO Only:</b> {len(nato_only)} countries<br>
-        → Includes USA, Canada, UK<br>
-        → Turkey, Albania, North Macedonia<br>
-        → Iceland, Norway, Montenegro<br><br>
-
-        <b style="color: #ffcc00;">EU Only:</b> {len(eu_only)} countries<br>
-        → Ireland, Austria (neutral states)<br>
-        → Cyprus (island nation)<br>
-        → Note: Malta not visible at this scale<br>
-    </p>
-    <p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
-        Total NATO: {len(nato_members)} members<br>
-        Total EU: {len(eu_members)} visible (27 total incl. Malta)
-    </p>
-    </div>
-    '''
-
-    # Legend with counts
-    legend_html = f'''
-    <div style="position: fixed;
-                bottom: 50px; right: 15px; width: 280px;
-                background-color: white; border:2px solid grey; z-index:9999;
-                font-size:11px; padding: 12px; line-height: 1.6;">
-    <p style="margin: 0 0 8px 0; font-weight: bold;">Membership Categories</p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #9933cc; padding: 2px 12px; border-radius: 3px; color: white;">■</span>
-        <b>Both NATO & EU</b> ({len(both_nato_eu)} countries)
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #0066cc; padding: 2px 12px; border-radius: 3px; color: white;">■</span>
-        <b>NATO Only</b> ({len(nato_only)} countries)
-    </p>
-    <p style="margin: 4px 0;">
-        <span style="background-color: #ffcc00; padding: 2px 12px; border-radius: 3px;">■</span>
-        <b>EU Only</b> ({len(eu_only)} countries)
-    </p>
-    <p style="margin: 8px 0 4px 0; border-top: 1px solid #ccc; padding-top: 8px;">
-        <i class="fa fa-star" style="color: darkblue;"></i> NATO HQ (Brussels)<br>
-        <i class="fa fa-star" style="color: orange;"></i> EU HQ (Brussels)
-    </p>
-    <p style="margin: 8px 0 0 0; font-size: 9px; color: #666;">
-        Belgium: Member of both alliances<br>
-        and hosts both headquarters
-    </p>
-    </div>
-    '''
-
-    m.get_root().html.add_child(folium.Element(overview_html))
-    m.get_root().html.add_child(folium.Element(legend_html))
-
-    m.save(output_file)
+    counts = dict(both=len(BOTH_NATO_EU), nato_only=len(NATO_ONLY), eu_only=len(EU_ONLY),
+                  nato_total=len(NATO_MEMBERS), eu_total=len(EU_MEMBERS))
+    m.get_root().html.add_child(folium.Element(OVERVIEW_HTML.format(**counts)))
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML.format(**counts)))
+
+    save_map(m, output_file)
+    write_gzip_copy(output_file)
     print(f"✓ NATO-EU membership map saved to {output_file}")
-    return m, both_nato_eu, nato_only, eu_only
+    return m, BOTH_NATO_EU, NATO_ONLY, EU_ONLY
 
 
 if __name__ == "__main__":
@@ -245,43 +253,21 @@ if __name__ == "__main__":
     print("NATO & EU MEMBERSHIP - Current Status (2024)")
     print("=" * 70)
 
-    nato_members = {
-        'Belgium', 'Canada', 'Denmark', 'France', 'Iceland', 'Italy',
-        'Luxembourg', 'Netherlands', 'Norway', 'Portugal', 'United Kingdom',
-        'United States of America', 'Greece', 'Turkey', 'Germany', 'Spain',
-        'Czechia', 'Hungary', 'Poland', 'Bulgaria', 'Estonia', 'Latvia',
-        'Lithuania', 'Romania', 'Slovakia', 'Slovenia', 'Albania', 'Croatia',
-        'Montenegro', 'North Macedonia', 'Finland', 'Sweden'
-    }
-
-    eu_members = {
-        'Belgium', 'France', 'Germany', 'Italy', 'Luxembourg', 'Netherlands',
-        'Denmark', 'Ireland', 'Greece', 'Spain', 'Portugal', 'Austria',
-        'Finland', 'Sweden', 'Cyprus', 'Czechia', 'Estonia', 'Hungary',
-        'Latvia', 'Lithuania', 'Poland', 'Slovakia', 'Slovenia',
-        'Bulgaria', 'Romania', 'Croatia'
-        # Note: Malta excluded (too small for 110m scale map)
-    }
-
-    both = nato_members.intersection(eu_members)
-    nato_only = nato_members - eu_members
-    eu_only = eu_members - nato_members
-
     print(f"\nMembership Statistics:")
-    print(f"  Total NATO members: {len(nato_members)}")
-    print(f"  Total EU members: {len(eu_members)} visible (27 total, Malta not shown)")
-    print(f"  Both NATO & EU: {len(both)}")
-    print(f"  NATO only: {len(nato_only)}")
-    print(f"  EU only: {len(eu_only)}")
+    print(f"  Total NATO members: {len(NATO_MEMBERS)}")
+    print(f"  Total EU members: {len(EU_MEMBERS)} visible (27 total, Malta not shown)")
+    print(f"  Both NATO & EU: {len(BOTH_NATO_EU)}")
+    print(f"  NATO only: {len(NATO_ONLY)}")
+    print(f"  EU only: {len(EU_ONLY)}")
 
-    print(f"\nBoth NATO & EU ({len(both)} countries):")
-    print(f"  {', '.join(sorted(both))}")
+    print(f"\nBoth NATO & EU ({len(BOTH_NATO_EU)} countries):")
+    print(f"  {', '.join(sorted(BOTH_NATO_EU))}")
 
-    print(f"\nNATO Only ({len(nato_only)} countries):")
-    print(f"  {', '.join(sorted(nato_only))}")
+    print(f"\nNATO Only ({len(NATO_ONLY)} countries):")
+    print(f"  {', '.join(sorted(NATO_ONLY))}")
 
-    print(f"\nEU Only ({len(eu_only)} countries):")
-    print(f"  {', '.join(sorted(eu_only))}")
+    print(f"\nEU Only ({len(EU_ONLY)} countries):")
+    print(f"  {', '.join(sorted(EU_ONLY))}")
 
     print("\nKey Notes:")
     print("  • Belgium hosts both NATO and EU headquarters in Brussels")